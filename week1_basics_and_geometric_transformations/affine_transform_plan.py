@@ -0,0 +1,203 @@
+import time
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from affine_transformations import build_forward_matrix, fit_transform_to_canvas
+
+
+class AffineTransformPlan:
+    """
+    Precomputed remap tables for one affine transformation of one input size.
+    The six matrices, the canvas bounding box and the inverse mapping are computed once;
+    the sampling coordinates are stored as compact fixed-point tables (int16 integer
+    coordinates + uint16 interpolation-table index, as produced by cv2.convertMaps),
+    so applying the plan to a new frame is a single cv2.remap lookup pass.
+
+    Pixels whose source position falls outside the input image are filled with 0,
+    matching warp_affine_array and PIL's Image.transform.
+    """
+
+    def __init__(self, image_size, scale=(1.0, 1.0), shear_params=(0.0, 0.0), angle_deg=0.0,
+                 translate=(0.0, 0.0), mirror_scale=(1.0, 1.0), strip_rows=256):
+        """
+        Args:
+            image_size (tuple): (width, height) of the frames the plan will be applied to.
+            scale, shear_params, angle_deg, translate, mirror_scale: Same meaning as in affine_transform_image.
+            strip_rows (int): Number of output rows converted per pass while building the tables.
+        """
+        self.image_size = tuple(image_size)
+        M_forward = build_forward_matrix(scale, shear_params, angle_deg, translate, mirror_scale)
+        self.M_final_forward_to_canvas, self.output_size = fit_transform_to_canvas(M_forward, self.image_size)
+
+        new_width, new_height = self.output_size
+        if new_width <= 0 or new_height <= 0:
+            raise ValueError(f"Calculated output dimensions are non-positive ({new_width}x{new_height}).")
+        if max(self.image_size) >= 2 ** 15 or max(self.output_size) >= 2 ** 15:
+            raise ValueError("Fixed-point remap tables support images up to 32767 pixels per side.")
+
+        # Fixed-point tables: (x, y) integer parts and the fractional interpolation-table index
+        self.map_xy = np.empty((new_height, new_width, 2), dtype=np.int16)
+        self.map_frac = np.empty((new_height, new_width), dtype=np.uint16)
+        self._build_tables(np.linalg.inv(self.M_final_forward_to_canvas), strip_rows)
+
+    def _build_tables(self, M_inverse, strip_rows):
+        src_width, src_height = self.image_size
+        new_width, new_height = self.output_size
+        a, b, c = M_inverse[0]
+        d, e, f = M_inverse[1]
+        x_dst = np.arange(new_width, dtype=np.float64) + 0.5
+
+        for row_start in range(0, new_height, strip_rows):
+            row_stop = min(row_start + strip_rows, new_height)
+            y_dst = (np.arange(row_start, row_stop, dtype=np.float64) + 0.5)[:, np.newaxis]
+
+            # Same pixel-center convention as warp_affine_array
+            x_src = a * x_dst + b * y_dst + (c - 0.5)
+            y_src = d * x_dst + e * y_dst + (f - 0.5)
+            inside = (x_src >= -0.5) & (x_src < src_width - 0.5) & (y_src >= -0.5) & (y_src < src_height - 0.5)
+
+            # Inside points are clamped onto the image (edge pixels are replicated); outside
+            # points are sent two pixels past the border, where BORDER_CONSTANT yields the fill value.
+            map_x = np.where(inside, np.clip(x_src, 0, src_width - 1), -2).astype(np.float32)
+            map_y = np.where(inside, np.clip(y_src, 0, src_height - 1), -2).astype(np.float32)
+
+            map_xy, map_frac = cv2.convertMaps(map_x, map_y, cv2.CV_16SC2)
+            self.map_xy[row_start:row_stop] = map_xy
+            self.map_frac[row_start:row_stop] = map_frac
+
+    @property
+    def nbytes(self):
+        """Memory held by the remap tables, in bytes."""
+        return self.map_xy.nbytes + self.map_frac.nbytes
+
+    def apply(self, frame, out=None):
+        """
+        Applies the plan to one frame.
+
+        Args:
+            frame (np.array or PIL.Image.Image): Input frame of size `image_size`, (H, W) or (H, W, C).
+            out (np.array, optional): Preallocated output buffer of shape (new_height, new_width[, C])
+                                      and the frame's dtype.
+
+        Returns:
+            np.array (or PIL.Image.Image if a PIL image was given): The transformed frame.
+        """
+        is_pil = isinstance(frame, Image.Image)
+        frame_array = np.asarray(frame)
+        if (frame_array.shape[1], frame_array.shape[0]) != self.image_size:
+            raise ValueError(f"Frame size {frame_array.shape[1]}x{frame_array.shape[0]} does not match "
+                             f"the plan's input size {self.image_size[0]}x{self.image_size[1]}.")
+        if out is not None:
+            # cv2.remap silently allocates a new array when dst does not match, so check it here
+            new_width, new_height = self.output_size
+            expected_shape = (new_height, new_width) + frame_array.shape[2:]
+            if out.shape != expected_shape or out.dtype != frame_array.dtype:
+                raise ValueError(f"Output buffer must have shape {expected_shape} and dtype {frame_array.dtype}, "
+                                 f"got {out.shape} and {out.dtype}.")
+
+        result = cv2.remap(frame_array, self.map_xy, self.map_frac, cv2.INTER_LINEAR, dst=out,
+                           borderMode=cv2.BORDER_CONSTANT, borderValue=0)
+        return Image.fromarray(result) if is_pil else result
+
+
+class TransformPlanCache:
+    """
+    LRU cache of AffineTransformPlan objects with a memory cap.
+    Plans are keyed by (input size, scale, shear, angle, translate, mirror). When the total
+    size of the cached remap tables exceeds `max_bytes`, the least recently used plans are dropped.
+    """
+
+    def __init__(self, max_bytes=256 * 1024 ** 2):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._plans = OrderedDict()
+
+    def get(self, image_size, scale=(1.0, 1.0), shear_params=(0.0, 0.0), angle_deg=0.0,
+            translate=(0.0, 0.0), mirror_scale=(1.0, 1.0)):
+        """Returns the cached plan for these parameters, building (and caching) it if needed."""
+        key = (tuple(image_size), tuple(scale), tuple(shear_params), float(angle_deg),
+               tuple(translate), tuple(mirror_scale))
+        plan = self._plans.get(key)
+        if plan is not None:
+            self.hits += 1
+            self._plans.move_to_end(key)
+            return plan
+
+        self.misses += 1
+        plan = AffineTransformPlan(image_size, scale, shear_params, angle_deg, translate, mirror_scale)
+        if plan.nbytes <= self.max_bytes:  # Plans larger than the whole budget are used but not kept
+            self._plans[key] = plan
+            self.current_bytes += plan.nbytes
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self._plans.popitem(last=False)
+                self.current_bytes -= evicted.nbytes
+        return plan
+
+    def clear(self):
+        self._plans.clear()
+        self.current_bytes = 0
+
+    def __len__(self):
+        return len(self._plans)
+
+
+# Shared cache used by affine_transform_frame
+default_plan_cache = TransformPlanCache()
+
+
+def affine_transform_frame(frame, scale=(1.0, 1.0), shear_params=(0.0, 0.0), angle_deg=0.0, translate=(0.0, 0.0),
+                           mirror_scale=(1.0, 1.0), cache=None):
+    """
+    Applies an affine transformation to a frame through a cached AffineTransformPlan.
+    Repeated calls with the same frame size and parameters reuse the precomputed remap tables.
+
+    Args:
+        frame (np.array or PIL.Image.Image): Input frame.
+        scale, shear_params, angle_deg, translate, mirror_scale: Same meaning as in affine_transform_image.
+        cache (TransformPlanCache, optional): Plan cache to use (defaults to the shared cache).
+
+    Returns:
+        np.array (or PIL.Image.Image): The transformed frame.
+    """
+    cache = default_plan_cache if cache is None else cache
+    if isinstance(frame, Image.Image):
+        image_size = frame.size
+    else:
+        image_size = (frame.shape[1], frame.shape[0])
+    plan = cache.get(image_size, scale, shear_params, angle_deg, translate, mirror_scale)
+    return plan.apply(frame)
+
+
+if __name__ == '__main__':
+    # Path to your image file.
+    IMAGE_PATH = "sample_images/foto1.jpeg"
+    try:
+        frame = np.array(Image.open(IMAGE_PATH).convert("RGB"))
+        params = dict(scale=(1.2, 1.2), angle_deg=45.0, translate=(10.0, 0.0), mirror_scale=(-1.0, -1.0))
+
+        # Simulate a camera feed: the same transformation applied to many same-size frames
+        num_frames = 10
+        start = time.perf_counter()
+        for _ in range(num_frames):
+            transformed = affine_transform_frame(frame, **params)
+        elapsed = time.perf_counter() - start
+
+        print(f"Transformed {num_frames} frames of size {frame.shape[1]}x{frame.shape[0]} "
+              f"in {elapsed:.3f} s ({elapsed / num_frames * 1000:.1f} ms per frame, first frame builds the plan).")
+        print(f"Plan cache: {len(default_plan_cache)} plan(s), {default_plan_cache.current_bytes / 1024 ** 2:.1f} MB, "
+              f"{default_plan_cache.hits} hits, {default_plan_cache.misses} misses.")
+
+    except FileNotFoundError:
+        print(f"Error: The file '{IMAGE_PATH}' was not found. Please check the file path.")
+    except Exception as e:
+        import traceback
+
+        print(f"An unexpected error occurred: {e}")
+        print("--- Traceback ---")
+        traceback.print_exc()
+        print("-----------------")
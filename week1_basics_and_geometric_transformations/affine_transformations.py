@@ -1,33 +1,57 @@
+import time
+
+import cv2
 from PIL import Image
 import numpy as np
 from matplotlib import pyplot as plt
 
+from bilinear_interpolation import bilinear_interpolate
 
-def affine_transform_image(image_pil, scale=(1.0, 1.0), shear_params=(0.0, 0.0), angle_deg=0.0, translate=(0.0, 0.0),
-                           mirror_scale=(1.0, 1.0)):
+
+def scale_matrix(sx, sy):
+    """Scaling Matrix"""
+    return np.array([[sx, 0, 0], [0, sy, 0], [0, 0, 1]], dtype=np.float64)
+
+
+def shear_x_matrix(k_x):
+    """ShearX Matrix (shears x-coordinate based on y)"""
+    return np.array([[1, k_x, 0], [0, 1, 0], [0, 0, 1]], dtype=np.float64)
+
+
+def shear_y_matrix(k_y):
+    """ShearY Matrix (shears y-coordinate based on x)"""
+    return np.array([[1, 0, 0], [k_y, 1, 0], [0, 0, 1]], dtype=np.float64)
+
+
+def rotation_matrix(angle_deg):
+    """Standard Counter-Clockwise Rotation Matrix (angle in degrees)"""
+    theta_rad = np.deg2rad(angle_deg)  # Convert angle to radians
+    cos_t, sin_t = np.cos(theta_rad), np.sin(theta_rad)
+    return np.array([[cos_t, -sin_t, 0], [sin_t, cos_t, 0], [0, 0, 1]], dtype=np.float64)
+
+
+def mirror_matrix(ax, ay):
+    """Mirroring Matrix (ax=-1 mirrors horizontally, ay=-1 vertically)"""
+    return np.array([[ax, 0, 0], [0, ay, 0], [0, 0, 1]], dtype=np.float64)
+
+
+def translation_matrix(tx, ty):
+    """Translation Matrix"""
+    return np.array([[1, 0, tx], [0, 1, ty], [0, 0, 1]], dtype=np.float64)
+
+
+def build_forward_matrix(scale=(1.0, 1.0), shear_params=(0.0, 0.0), angle_deg=0.0, translate=(0.0, 0.0),
+                         mirror_scale=(1.0, 1.0)):
     """
-    Applies a sequence of affine transformations to a PIL Image.
+    Builds the 3x3 forward affine matrix M_forward for the parameters of affine_transform_image.
     The transformation order is: Scale -> ShearX -> ShearY -> Rotate -> Mirror -> Translate.
-    The resulting image is sized to fit all transformed pixels, with the top-left
-    of the transformed content aligned with the top-left (0,0) of the output image.
-
-    Args:
-        image_pil (PIL.Image.Image): The input PIL Image object.
-        scale (tuple): (sx, sy) scaling factors for x and y axes.
-        shear_params (tuple): (kx, ky) shear factors. kx shears along x-axis, ky along y-axis.
-                              Note: PIL's default affine transform uses a slightly different shear definition.
-                              This implementation builds matrices according to common geometric interpretations.
-        angle_deg (float): Counter-clockwise rotation angle in degrees.
-        translate (tuple): (tx, ty) translation distances for x and y axes.
-        mirror_scale (tuple): (ax, ay) mirroring factors. ax=-1 mirrors horizontally, ay=-1 vertically.
 
     Returns:
-        PIL.Image.Image: The transformed PIL Image object.
+        np.array: 3x3 matrix mapping input (source) coordinates to output coordinates.
     """
     k_x, k_y = shear_params
     tx, ty = translate
     ax, ay = mirror_scale
-    theta_rad = np.deg2rad(angle_deg)  # Convert angle to radians
     sx, sy = scale
 
     # --- Constructing the forward transformation matrix M_forward ---
@@ -35,31 +59,37 @@ def affine_transform_image(image_pil, scale=(1.0, 1.0), shear_params=(0.0, 0.0),
     # P_out = M_forward * P_in
     # Order of matrix multiplication (applied to point from right to left):
     # M_forward = T * Mirror * R * Sh_y * Sh_x * Sc
-
-    # Scaling Matrix
-    Sc_mat = np.array([[sx, 0, 0], [0, sy, 0], [0, 0, 1]])
-    # ShearX Matrix (shears x-coordinate based on y)
-    Sh_x_mat = np.array([[1, k_x, 0], [0, 1, 0], [0, 0, 1]])
-    # ShearY Matrix (shears y-coordinate based on x)
-    Sh_y_mat = np.array([[1, 0, 0], [k_y, 1, 0], [0, 0, 1]])
-    # Standard Counter-Clockwise Rotation Matrix
-    cos_t, sin_t = np.cos(theta_rad), np.sin(theta_rad)
-    R_mat = np.array([[cos_t, -sin_t, 0], [sin_t, cos_t, 0], [0, 0, 1]])
-    # Mirroring Matrix
-    Mir_mat = np.array([[ax, 0, 0], [0, ay, 0], [0, 0, 1]])
-    # Translation Matrix
-    T_mat = np.array([[1, 0, tx], [0, 1, ty], [0, 0, 1]])
+    Sc_mat = scale_matrix(sx, sy)
+    Sh_x_mat = shear_x_matrix(k_x)
+    Sh_y_mat = shear_y_matrix(k_y)
+    R_mat = rotation_matrix(angle_deg)
+    Mir_mat = mirror_matrix(ax, ay)
+    T_mat = translation_matrix(tx, ty)
 
     # Combine transformations: T * Mirror * R * Sh_y * Sh_x * Sc
-    M_forward = T_mat @ Mir_mat @ R_mat @ Sh_y_mat @ Sh_x_mat @ Sc_mat
+    return T_mat @ Mir_mat @ R_mat @ Sh_y_mat @ Sh_x_mat @ Sc_mat
+
 
+def fit_transform_to_canvas(M_forward, image_size):
+    """
+    Computes the output canvas that fits all transformed pixels and the matching forward matrix.
+
+    Args:
+        M_forward (np.array): 3x3 forward affine matrix (source -> destination).
+        image_size (tuple): (width, height) of the source image.
+
+    Returns:
+        tuple: (M_final_forward_to_canvas, (new_width, new_height)). The matrix maps source
+               coordinates onto the canvas, with the top-left of the transformed content at (0,0).
+    """
     # --- Calculate new image dimensions to fit the transformed image ---
-    w, h = image_pil.size
-    # Original corners in homogeneous coordinates (x, y, 1)
-    # Points: (0,0), (w-1,0), (0,h-1), (w-1,h-1)
+    w, h = image_size
+    # Original corners in homogeneous coordinates (x, y, 1).
+    # PIL treats pixel (i, j) as the unit square [i, i+1) x [j, j+1), so the image spans
+    # the corners (0,0), (w,0), (0,h), (w,h); an identity transform keeps the w x h size.
     corners = np.array([
-        [0, w - 1, 0, w - 1],
-        [0, 0, h - 1, h - 1],
+        [0, w, 0, w],
+        [0, 0, h, h],
         [1, 1, 1, 1]
     ])
 
@@ -73,18 +103,6 @@ def affine_transform_image(image_pil, scale=(1.0, 1.0), shear_params=(0.0, 0.0),
     new_width = int(np.round(max_x_coord - min_x_coord))
     new_height = int(np.round(max_y_coord - min_y_coord))
 
-    if new_width <= 0 or new_height <= 0:
-        print(f"Warning: Calculated new image dimensions are non-positive ({new_width}x{new_height}). "
-              "This can happen with extreme mirror/scale parameters. Returning original image.")
-        return image_pil
-
-    # --- Prepare matrix for PIL.Image.transform ---
-    # PIL's transform method requires the *inverse* of the forward affine transformation matrix.
-    # This inverse matrix maps coordinates from the destination image back to the source image.
-    # P_in = M_inverse * P_out
-    # Additionally, we need to adjust the translation so the transformed image's
-    # top-left bounding box corner is at (0,0) in the output image canvas.
-
     # This matrix translates the content in the transformed coordinate system
     # so that its new bounding box's top-left corner moves to (0,0).
     T_adjust_origin = np.array([
@@ -95,7 +113,180 @@ def affine_transform_image(image_pil, scale=(1.0, 1.0), shear_params=(0.0, 0.0),
 
     # Final forward matrix that maps source to the new canvas (where content starts at 0,0)
     M_final_forward_to_canvas = T_adjust_origin @ M_forward
+    return M_final_forward_to_canvas, (new_width, new_height)
+
 
+def classify_axis_aligned(M_final_forward_to_canvas, tol=1e-9):
+    """
+    Detects transforms that only permute, flip or integer-replicate whole pixels.
+    That is the case when the 2x2 linear part has exactly one non-zero integer entry per
+    row and column (mirroring, rotations by multiples of 90 degrees, integer scales); the
+    translation is then absorbed by the canvas, so integer translations are covered too.
+
+    Returns:
+        dict or None: {'transpose', 'flip_x', 'flip_y', 'repeat_x', 'repeat_y'} describing the
+                      exact array operations, or None if the transform needs resampling.
+    """
+    A = M_final_forward_to_canvas[:2, :2]
+    rounded = np.round(A)
+    if not np.allclose(A, rounded, rtol=0, atol=tol):
+        return None
+
+    transpose = rounded[0, 0] == 0 and rounded[1, 1] == 0
+    if transpose:
+        # x_out depends on y_in and y_out on x_in: swap the axes first
+        sx, sy = rounded[0, 1], rounded[1, 0]
+    else:
+        sx, sy = rounded[0, 0], rounded[1, 1]
+        if rounded[0, 1] != 0 or rounded[1, 0] != 0:
+            return None
+    if sx == 0 or sy == 0:
+        return None
+
+    return {'transpose': bool(transpose), 'flip_x': bool(sx < 0), 'flip_y': bool(sy < 0),
+            'repeat_x': int(abs(sx)), 'repeat_y': int(abs(sy))}
+
+
+def apply_axis_aligned(image_array, classification):
+    """
+    Applies a classification from classify_axis_aligned with exact array operations
+    (np.swapaxes + np.flip make up np.rot90; np.repeat replicates pixels for integer upscales).
+    Flips and transposes are views; only np.repeat copies. Integer upscales through np.repeat
+    equal a nearest-neighbour resample, not a bicubic/bilinear one.
+    """
+    result = np.swapaxes(image_array, 0, 1) if classification['transpose'] else image_array
+    if classification['flip_y']:
+        result = np.flip(result, axis=0)
+    if classification['flip_x']:
+        result = np.flip(result, axis=1)
+    if classification['repeat_y'] > 1:
+        result = np.repeat(result, classification['repeat_y'], axis=0)
+    if classification['repeat_x'] > 1:
+        result = np.repeat(result, classification['repeat_x'], axis=1)
+    return result
+
+
+def is_pixel_permutation(classification):
+    """True if a classification only moves pixels (no replication), so any interpolation filter is exact."""
+    return (classification is not None
+            and classification['repeat_x'] == 1 and classification['repeat_y'] == 1)
+
+
+# PIL modes that round-trip losslessly through np.asarray / Image.fromarray
+FAST_PATH_MODES = ('L', 'RGB', 'RGBA', 'I', 'F')
+
+
+def choose_pyramid_level(M_forward, max_level=8):
+    """
+    Number of 2x pyramid reductions to apply before resampling, chosen from the linear part of M_forward.
+    The largest singular value is the least reduction in any direction (it covers scale and shear);
+    the level is the deepest one whose resolution is still at or above that scale, so the remaining
+    affine transform never has to upsample.
+
+    Returns:
+        int: 0 (no reduction) up to max_level.
+    """
+    largest_scale = np.linalg.svd(M_forward[:2, :2], compute_uv=False)[0]
+    if largest_scale <= 0 or largest_scale > 0.5:
+        return 0
+    return int(min(np.floor(np.log2(1.0 / largest_scale) + 1e-9), max_level))
+
+
+class GaussianPyramid:
+    """
+    Lazily built Gaussian pyramid (cv2.pyrDown) of a PIL image; level 0 is the image itself.
+    Build it once and pass it to affine_transform_image(pyramid=...) to reuse the levels across
+    many transforms of the same source. The pixels are copied at construction, so later in-place
+    edits of the image are not seen: build a new pyramid after modifying it.
+    """
+
+    def __init__(self, image_pil):
+        self.mode = image_pil.mode
+        self.size = image_pil.size
+        self.levels = [np.array(image_pil)]
+
+    def level(self, index):
+        """Returns pyramid level `index` as a PIL image, building missing levels on demand."""
+        while len(self.levels) <= index:
+            self.levels.append(cv2.pyrDown(self.levels[-1]))
+        return Image.fromarray(self.levels[index], mode=self.mode)
+
+
+# Modes cv2.pyrDown handles directly (uint8 with 1, 3 or 4 channels)
+PYRAMID_MODES = ('L', 'RGB', 'RGBA')
+
+
+def affine_transform_image(image_pil, scale=(1.0, 1.0), shear_params=(0.0, 0.0), angle_deg=0.0, translate=(0.0, 0.0),
+                           mirror_scale=(1.0, 1.0), use_pyramid=True, pyramid=None):
+    """
+    Applies a sequence of affine transformations to a PIL Image.
+    The transformation order is: Scale -> ShearX -> ShearY -> Rotate -> Mirror -> Translate.
+    The resulting image is sized to fit all transformed pixels, with the top-left
+    of the transformed content aligned with the top-left (0,0) of the output image.
+
+    Args:
+        image_pil (PIL.Image.Image): The input PIL Image object.
+        scale (tuple): (sx, sy) scaling factors for x and y axes.
+        shear_params (tuple): (kx, ky) shear factors. kx shears along x-axis, ky along y-axis.
+                              Note: PIL's default affine transform uses a slightly different shear definition.
+                              This implementation builds matrices according to common geometric interpretations.
+        angle_deg (float): Counter-clockwise rotation angle in degrees.
+        translate (tuple): (tx, ty) translation distances for x and y axes.
+        mirror_scale (tuple): (ax, ay) mirroring factors. ax=-1 mirrors horizontally, ay=-1 vertically.
+        use_pyramid (bool): When the transform shrinks the image by 2x or more in every direction, first
+                            reduce it by the nearest power of two above the target scale, then apply the
+                            remaining transform on that level. Chosen automatically from M_forward. This
+                            is for antialiasing (the bicubic transform does not prefilter): the level comes
+                            from a Gaussian pyramid (cv2.pyrDown chain), built for this call unless
+                            `pyramid` is given.
+        pyramid (GaussianPyramid, optional): Prebuilt pyramid of `image_pil`. It only affects caching:
+                                             the output is identical, but the levels are reused across
+                                             many transforms of one unchanged source.
+
+    Mirroring, rotations by multiples of 90 degrees and integer translations are detected from
+    the composed matrix and done with exact NumPy flips/transposes instead of a bicubic resample.
+
+    Returns:
+        PIL.Image.Image: The transformed PIL Image object.
+    """
+    M_forward = build_forward_matrix(scale, shear_params, angle_deg, translate, mirror_scale)
+    M_final_forward_to_canvas, (new_width, new_height) = fit_transform_to_canvas(M_forward, image_pil.size)
+
+    if new_width <= 0 or new_height <= 0:
+        print(f"Warning: Calculated new image dimensions are non-positive ({new_width}x{new_height}). "
+              "This can happen with extreme mirror/scale parameters. Returning original image.")
+        return image_pil
+
+    # --- Exact fast paths for axis-aligned transforms ---
+    classification = classify_axis_aligned(M_final_forward_to_canvas)
+    if is_pixel_permutation(classification) and image_pil.mode in FAST_PATH_MODES:
+        result_array = apply_axis_aligned(np.asarray(image_pil), classification)
+        return Image.fromarray(np.ascontiguousarray(result_array), mode=image_pil.mode)
+
+    # --- Antialiased pyramid downscaling ---
+    # Resample from the Gaussian pyramid level closest to (but not below) the target scale. pyrDown
+    # keeps every other pixel of the blurred level (level pixel i sits on pixel 2i of the level
+    # below), so with pixel centers at +0.5 a level coordinate u maps to 2**level * u - (2**level - 1) / 2.
+    source_image = image_pil
+    level = choose_pyramid_level(M_forward) if use_pyramid and image_pil.mode in PYRAMID_MODES else 0
+    if level > 0:
+        if pyramid is None:
+            pyramid = GaussianPyramid(image_pil)  # Temporary: the same levels, without reuse
+        elif pyramid.size != image_pil.size or pyramid.mode != image_pil.mode:
+            raise ValueError("The pyramid was built from a different image.")
+        source_image = pyramid.level(level)
+        step = float(1 << level)
+        level_to_original = np.array([[step, 0.0, -(step - 1.0) / 2.0],
+                                      [0.0, step, -(step - 1.0) / 2.0],
+                                      [0.0, 0.0, 1.0]])
+        M_final_forward_to_canvas = M_final_forward_to_canvas @ level_to_original
+
+    # --- Prepare matrix for PIL.Image.transform ---
+    # PIL's transform method requires the *inverse* of the forward affine transformation matrix.
+    # This inverse matrix maps coordinates from the destination image back to the source image.
+    # P_in = M_inverse * P_out
+    # fit_transform_to_canvas has already adjusted the translation so the transformed image's
+    # top-left bounding box corner is at (0,0) in the output image canvas.
     try:
         M_inverse_for_pil = np.linalg.inv(M_final_forward_to_canvas)
     except np.linalg.LinAlgError:
@@ -113,7 +304,7 @@ def affine_transform_image(image_pil, scale=(1.0, 1.0), shear_params=(0.0, 0.0),
     )
 
     # Apply the transformation using PIL
-    transformed_image = image_pil.transform(
+    transformed_image = source_image.transform(
         (new_width, new_height),  # Output size
         Image.AFFINE,  # Transformation type
         pil_coeffs,  # The 6 coefficients of the inverse matrix
@@ -122,6 +313,74 @@ def affine_transform_image(image_pil, scale=(1.0, 1.0), shear_params=(0.0, 0.0),
     return transformed_image
 
 
+def warp_affine_array(image_array, M_final_forward_to_canvas, output_size, strip_rows=64, fill_value=0, out=None):
+    """
+    Warps a NumPy image with bilinear interpolation, without a round trip through PIL.
+    Uses the same M_final_forward_to_canvas matrix and the same pixel convention as
+    affine_transform_image (pixel centers at +0.5), so the two paths line up.
+    The inverse coordinate grid is built one strip of rows at a time, which bounds
+    the temporary float64 arrays by `strip_rows * new_width` instead of the full canvas.
+
+    Args:
+        image_array (np.array): Grayscale (H, W) or color (H, W, C) image.
+        M_final_forward_to_canvas (np.array): 3x3 forward matrix from fit_transform_to_canvas.
+        output_size (tuple): (new_width, new_height) of the output canvas.
+        strip_rows (int): Number of output rows sampled per pass.
+        fill_value (number): Value written where the inverse mapping falls outside the source.
+        out (np.array, optional): Preallocated output of shape (new_height, new_width[, C]).
+
+    Returns:
+        np.array: The warped image, with the same dtype as the input (unless `out` is given).
+    """
+    new_width, new_height = output_size
+    src_height, src_width = image_array.shape[:2]
+    if out is None:
+        out = np.empty((new_height, new_width) + image_array.shape[2:], dtype=image_array.dtype)
+    elif out.shape[:2] != (new_height, new_width):
+        raise ValueError(f"Output buffer has shape {out.shape}, expected ({new_height}, {new_width}, ...).")
+
+    # Flips and quarter turns sample exact pixel centers, so they are copied instead of interpolated
+    classification = classify_axis_aligned(M_final_forward_to_canvas)
+    if is_pixel_permutation(classification):
+        permuted = apply_axis_aligned(image_array, classification)
+        if permuted.shape[:2] == out.shape[:2]:
+            out[...] = permuted
+            return out
+
+    # Inverse matrix maps destination coordinates back to the source image
+    M_inverse = np.linalg.inv(M_final_forward_to_canvas)
+    a, b, c = M_inverse[0]
+    d, e, f = M_inverse[1]
+
+    # Destination pixel centers for one row; reused by every strip
+    x_dst = np.arange(new_width, dtype=np.float64) + 0.5
+
+    is_integer = np.issubdtype(out.dtype, np.integer)
+    if is_integer:
+        dtype_info = np.iinfo(out.dtype)
+
+    for row_start in range(0, new_height, strip_rows):
+        row_stop = min(row_start + strip_rows, new_height)
+        y_dst = (np.arange(row_start, row_stop, dtype=np.float64) + 0.5)[:, np.newaxis]
+
+        # Continuous source coordinates, shifted back to index space (pixel centers at integers)
+        x_src = a * x_dst + b * y_dst + (c - 0.5)
+        y_src = d * x_dst + e * y_dst + (f - 0.5)
+
+        # Points whose source pixel lies outside the image get the fill value
+        inside = (x_src >= -0.5) & (x_src < src_width - 0.5) & (y_src >= -0.5) & (y_src < src_height - 0.5)
+
+        values = bilinear_interpolate(image_array, y_src, x_src)
+        if is_integer:
+            values = np.clip(np.rint(values), dtype_info.min, dtype_info.max)
+
+        strip = out[row_start:row_stop]
+        strip[...] = fill_value
+        strip[inside] = values[inside]
+
+    return out
+
+
 if __name__ == '__main__':
     # Path to your image file.
     # Make sure "foto1.jpeg" is in the same directory as this script,
@@ -141,19 +400,36 @@ if __name__ == '__main__':
             mirror_scale=(-1.0, -1.0)  # Mirror on both axes (PDF uses (-1,-1))
         )
 
+        # Pure mirroring is detected from the matrix and done with np.flip instead of a resample
+        start = time.perf_counter()
+        mirrored_img = affine_transform_image(original_image, mirror_scale=(-1.0, -1.0))
+        print(f"Mirror (-1, -1) fast path: {(time.perf_counter() - start) * 1000:.1f} ms, "
+              f"matches np.flip: {np.array_equal(np.array(mirrored_img), np.array(original_image)[::-1, ::-1])}")
+
+        # Same transformation resampled directly on the NumPy array (no PIL round trip)
+        M_forward = build_forward_matrix(scale=(1.2, 1.2), angle_deg=45.0, translate=(10.0, 0.0),
+                                         mirror_scale=(-1.0, -1.0))
+        M_canvas, canvas_size = fit_transform_to_canvas(M_forward, original_image.size)
+        transformed_array = warp_affine_array(np.array(original_image), M_canvas, canvas_size)
+
         # Display the original and transformed images
-        plt.figure(figsize=(12, 6))  # Adjust figure size as needed
+        plt.figure(figsize=(18, 6))  # Adjust figure size as needed
 
-        plt.subplot(1, 2, 1)
+        plt.subplot(1, 3, 1)
         plt.imshow(original_image)
         plt.title(f"Original Image: {IMAGE_PATH}")
         plt.axis('off')
 
-        plt.subplot(1, 2, 2)
+        plt.subplot(1, 3, 2)
         plt.imshow(transformed_img)
         plt.title("Affine Transformed Image")
         plt.axis('off')
 
+        plt.subplot(1, 3, 3)
+        plt.imshow(transformed_array)
+        plt.title("NumPy warp_affine_array (bilinear)")
+        plt.axis('off')
+
         plt.tight_layout()  # Adjusts subplot params for a tight layout.
         plt.show()
 
@@ -0,0 +1,159 @@
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+
+# File extensions considered images when scanning a directory
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.gif', '.tif', '.tiff', '.webp')
+
+
+def probe_image(path):
+    """
+    Reads width, height, mode, format and DPI from an image file header without decoding pixels.
+    Image.open() is lazy: it parses the header and stops, so this costs one small read per file
+    (unlike np.array(Image.open(path)), which decodes the whole image).
+
+    Args:
+        path (str): Path to the image file.
+
+    Returns:
+        dict: {'width', 'height', 'mode', 'format', 'dpi'}; 'dpi' is an (x, y) tuple or None.
+    """
+    with Image.open(path) as img:
+        width, height = img.size
+        dpi = img.info.get('dpi')
+        if dpi is None and 'jfif_density' in img.info and img.info.get('jfif_unit') == 1:
+            dpi = img.info['jfif_density']  # JFIF density in dots per inch
+        return {
+            'width': width,
+            'height': height,
+            'mode': img.mode,
+            'format': img.format,
+            'dpi': [float(value) for value in dpi] if dpi is not None else None,
+        }
+
+
+class ImageMetadataIndex:
+    """
+    Persistent metadata index of a directory tree, keyed by file path.
+    Each entry remembers the file's mtime and size; update() re-probes only files that are new
+    or whose mtime/size changed, and drops entries for files that disappeared. Unreadable files
+    are remembered in `failures` with their mtime and size too, so they are not probed again until
+    they change. The index is stored as JSON, so repeated inventories of large folders only pay
+    for what changed.
+    """
+
+    def __init__(self, index_path):
+        self.index_path = index_path
+        self.entries = {}
+        self.failures = {}
+        if os.path.exists(index_path):
+            with open(index_path, 'r', encoding='utf-8') as index_file:
+                data = json.load(index_file)
+            if set(data) == {'entries', 'failures'}:
+                self.entries, self.failures = data['entries'], data['failures']
+            else:  # Index written before failures were recorded: a plain {path: entry} mapping
+                self.entries = data
+
+    def save(self):
+        # Write to a temporary file first so an interrupted save never corrupts the index
+        temp_path = self.index_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as index_file:
+            json.dump({'entries': self.entries, 'failures': self.failures}, index_file)
+        os.replace(temp_path, self.index_path)
+
+    def update(self, root, workers=8, extensions=IMAGE_EXTENSIONS):
+        """
+        Scans `root` recursively and refreshes the index, probing changed files in parallel.
+
+        Args:
+            root (str): Directory to scan.
+            workers (int): Number of probe threads.
+            extensions (tuple): Lower-case file extensions treated as images.
+
+        Returns:
+            dict: Counts of 'probed', 'reused', 'removed' and 'failed' files, plus 'seconds'. 'failed'
+                  counts files that failed in this run; known failures that did not change are
+                  counted in 'reused'.
+        """
+        start = time.perf_counter()
+        current = {}
+        for dir_path, _, file_names in os.walk(root):
+            for file_name in file_names:
+                if file_name.lower().endswith(extensions):
+                    path = os.path.join(dir_path, file_name)
+                    stat = os.stat(path)
+                    current[path] = (stat.st_mtime_ns, stat.st_size)
+
+        def unchanged(record, mtime_ns, size):
+            return record is not None and record['mtime_ns'] == mtime_ns and record['size'] == size
+
+        to_probe = [path for path, (mtime_ns, size) in current.items()
+                    if not unchanged(self.entries.get(path), mtime_ns, size)
+                    and not unchanged(self.failures.get(path), mtime_ns, size)]
+
+        removed = [path for path in self.entries if path not in current]
+        for path in removed:
+            del self.entries[path]
+        for path in [path for path in self.failures if path not in current]:
+            del self.failures[path]
+
+        failed = 0
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for path, metadata in zip(to_probe, executor.map(_probe_or_none, to_probe)):
+                mtime_ns, size = current[path]
+                if metadata is None:
+                    failed += 1
+                    self.entries.pop(path, None)
+                    self.failures[path] = {'mtime_ns': mtime_ns, 'size': size}
+                    continue
+                metadata.update(mtime_ns=mtime_ns, size=size)
+                self.entries[path] = metadata
+                self.failures.pop(path, None)
+
+        self.save()
+        return {
+            'probed': len(to_probe) - failed,
+            'reused': len(current) - len(to_probe),
+            'removed': len(removed),
+            'failed': failed,
+            'seconds': time.perf_counter() - start,
+        }
+
+
+def _probe_or_none(path):
+    """probe_image that returns None for unreadable or non-image files instead of raising."""
+    try:
+        return probe_image(path)
+    except (OSError, SyntaxError, ValueError):
+        return None
+
+
+if __name__ == '__main__':
+    # Directory to inventory and where to keep the index (outside the working tree)
+    IMAGE_DIR = "sample_images"
+    INDEX_PATH = os.path.join(tempfile.gettempdir(), "sample_images_index.json")
+    try:
+        index = ImageMetadataIndex(INDEX_PATH)
+        for run in range(2):
+            stats = index.update(IMAGE_DIR)
+            print(f"Run {run}: probed {stats['probed']}, reused {stats['reused']}, removed {stats['removed']}, "
+                  f"failed {stats['failed']} in {stats['seconds'] * 1000:.1f} ms")
+
+        for path, metadata in sorted(index.entries.items()):
+            dpi_text = f"{metadata['dpi'][0]:g}x{metadata['dpi'][1]:g}" if metadata['dpi'] else "Not specified"
+            print(f"{path}: {metadata['width']}x{metadata['height']} {metadata['mode']} "
+                  f"({metadata['format']}), DPI: {dpi_text}")
+
+    except FileNotFoundError as fnf_error:
+        print(f"Error: {fnf_error}")
+    except Exception as e:
+        import traceback
+
+        print(f"An unexpected error occurred: {e}")
+        print("--- Traceback ---")
+        traceback.print_exc()
+        print("-----------------")
@@ -0,0 +1,157 @@
+import os
+import tempfile
+import time
+from collections import OrderedDict
+
+import numpy as np
+from PIL import Image
+
+from bilinear_interpolation import bilinear_interpolate
+
+
+class TileCache:
+    """
+    LRU cache of tiles read from an on-disk raster.
+    The raster can be an np.memmap or any tiled on-disk array that exposes `.shape` and NumPy-style
+    2-D slicing (e.g. raster[r0:r1, c0:c1] on an HDF5/Zarr dataset). Each tile is loaded together
+    with a one-pixel halo on its bottom and right edges, so every bilinear neighborhood whose
+    top-left pixel lies in the tile can be sampled from that tile alone.
+    """
+
+    def __init__(self, raster, tile_size=512, max_tiles=64):
+        self.raster = raster
+        self.tile_size = tile_size
+        self.max_tiles = max_tiles
+        self.hits = 0
+        self.misses = 0
+        self._tiles = OrderedDict()
+
+    @property
+    def tiles_x(self):
+        return -(-self.raster.shape[1] // self.tile_size)  # Ceiling division
+
+    def get(self, tile_row, tile_col):
+        """Returns (tile_array, row_offset, col_offset) for the tile at (tile_row, tile_col)."""
+        key = (tile_row, tile_col)
+        tile = self._tiles.get(key)
+        if tile is not None:
+            self.hits += 1
+            self._tiles.move_to_end(key)
+            return tile
+
+        self.misses += 1
+        height, width = self.raster.shape[:2]
+        row_start, col_start = tile_row * self.tile_size, tile_col * self.tile_size
+        row_stop = min(row_start + self.tile_size + 1, height)  # +1 row of halo
+        col_stop = min(col_start + self.tile_size + 1, width)  # +1 column of halo
+        tile = (np.array(self.raster[row_start:row_stop, col_start:col_stop]), row_start, col_start)
+
+        self._tiles[key] = tile
+        if len(self._tiles) > self.max_tiles:
+            self._tiles.popitem(last=False)
+        return tile
+
+
+def bilinear_interpolate_tiled(raster, y_coord, x_coord, tile_size=512, cache=None):
+    """
+    Bilinear interpolation over a raster that does not fit in RAM.
+    Query points are grouped by the tile that holds their top-left neighbor, each tile is loaded
+    (with its one-pixel halo) once, bilinear_interpolate runs on the tile in memory, and the
+    results are scattered back into the original query order. The values equal
+    bilinear_interpolate(raster_in_memory, y_coord, x_coord).
+
+    Args:
+        raster (np.memmap or array-like): (H, W) or (H, W, C) raster supporting 2-D slicing.
+        y_coord (float or np.array): The y-coordinate(s) for interpolation.
+        x_coord (float or np.array): The x-coordinate(s) for interpolation.
+        tile_size (int): Tile side in pixels (ignored if `cache` is given).
+        cache (TileCache, optional): Cache to reuse across calls, e.g. for successive query batches.
+
+    Returns:
+        tuple: (values, stats). `values` has shape coords.shape (+ (C,) for color rasters);
+               `stats` reports points, tiles touched, tile loads, cache hits, hit rate and throughput.
+    """
+    start = time.perf_counter()
+    if cache is None:
+        cache = TileCache(raster, tile_size)
+    hits_before, misses_before = cache.hits, cache.misses
+    height, width = raster.shape[:2]
+
+    y, x = np.broadcast_arrays(np.asarray(y_coord, dtype=np.float64), np.asarray(x_coord, dtype=np.float64))
+    coord_shape = y.shape
+    y = y.ravel()
+    x = x.ravel()
+
+    # Tile of the (clipped) top-left neighbor of every query point
+    tile_rows = np.clip(np.floor(y), 0, height - 1).astype(np.int64) // cache.tile_size
+    tile_cols = np.clip(np.floor(x), 0, width - 1).astype(np.int64) // cache.tile_size
+    tile_ids = tile_rows * cache.tiles_x + tile_cols
+
+    # Group the points by tile; the stable sort keeps the original order inside each group
+    order = np.argsort(tile_ids, kind='stable')
+    sorted_ids = tile_ids[order]
+    unique_ids, group_starts = np.unique(sorted_ids, return_index=True)
+    group_stops = np.append(group_starts[1:], len(sorted_ids))
+
+    values = np.empty((len(y),) + tuple(raster.shape[2:]), dtype=np.float64)
+    for tile_id, group_start, group_stop in zip(unique_ids, group_starts, group_stops):
+        tile, row_offset, col_offset = cache.get(*divmod(int(tile_id), cache.tiles_x))
+        indices = order[group_start:group_stop]
+        # Points outside the image clip to the tile border exactly as they would clip to the image border
+        values[indices] = bilinear_interpolate(tile, y[indices] - row_offset, x[indices] - col_offset)
+
+    elapsed = time.perf_counter() - start
+    hits = cache.hits - hits_before
+    loads = cache.misses - misses_before
+    stats = {
+        'points': len(y),
+        'tiles_touched': len(unique_ids),
+        'tile_loads': loads,
+        'cache_hits': hits,
+        'hit_rate': hits / (hits + loads) if hits + loads else 0.0,
+        'seconds': elapsed,
+        'points_per_second': len(y) / elapsed if elapsed > 0 else float('inf'),
+    }
+    return values.reshape(coord_shape + tuple(raster.shape[2:])), stats
+
+
+if __name__ == '__main__':
+    # Path to your image file.
+    IMAGE_PATH = "sample_images/foto1.jpeg"
+    try:
+        image_array = np.array(Image.open(IMAGE_PATH).convert("L"))
+        height, width = image_array.shape
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # Write the image to disk and reopen it as a memory-mapped raster
+            raster_path = os.path.join(temp_dir, "raster.dat")
+            raster = np.memmap(raster_path, dtype=np.uint8, mode='w+', shape=image_array.shape)
+            raster[:] = image_array
+            raster.flush()
+            del raster
+            raster = np.memmap(raster_path, dtype=np.uint8, mode='r', shape=image_array.shape)
+
+            rng = np.random.default_rng(0)
+            y_points = rng.uniform(0, height - 1, 1_000_000)
+            x_points = rng.uniform(0, width - 1, 1_000_000)
+
+            cache = TileCache(raster, tile_size=256, max_tiles=128)
+            for batch in range(2):
+                values, stats = bilinear_interpolate_tiled(raster, y_points, x_points, cache=cache)
+                print(f"Batch {batch}: {stats['points']} points, {stats['tiles_touched']} tiles, "
+                      f"{stats['tile_loads']} loads, hit rate {stats['hit_rate']:.2%}, "
+                      f"{stats['points_per_second'] / 1e6:.2f} M points/s")
+
+            in_memory = bilinear_interpolate(image_array, y_points, x_points)
+            print(f"Max difference to in-memory bilinear_interpolate: {np.abs(values - in_memory).max():.2e}")
+            del raster
+
+    except FileNotFoundError:
+        print(f"Error: The file '{IMAGE_PATH}' was not found. Please check the file path.")
+    except Exception as e:
+        import traceback
+
+        print(f"An unexpected error occurred: {e}")
+        print("--- Traceback ---")
+        traceback.print_exc()
+        print("-----------------")
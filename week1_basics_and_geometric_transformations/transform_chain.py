@@ -0,0 +1,180 @@
+import time
+
+import numpy as np
+from PIL import Image
+from matplotlib import pyplot as plt
+
+from affine_transformations import (affine_transform_image, fit_transform_to_canvas, mirror_matrix,
+                                    rotation_matrix, scale_matrix, shear_x_matrix, shear_y_matrix,
+                                    translation_matrix, warp_affine_array)
+
+
+class TransformChain:
+    """
+    A composable sequence of affine steps that is resampled only once.
+    Steps are added in the order they should be applied to the image (e.g. rotate, then scale,
+    then shear). apply() multiplies all step matrices into one M_forward, computes the canvas
+    bounds once and resamples once, instead of blurring the image again at every step.
+
+    Example:
+        chain = TransformChain().rotate(30).scale(1.5, 1.5).shear_x(0.2)
+        result = chain.apply(image_pil)
+        print(chain.timings)
+    """
+
+    def __init__(self):
+        self.steps = []  # List of (step name, parameters, 3x3 matrix) in application order
+        self.timings = {}  # Stage timings (seconds) of the last apply()/apply_sequential() call
+
+    def _add(self, name, params, matrix):
+        self.steps.append((name, params, matrix))
+        return self
+
+    def scale(self, sx, sy):
+        return self._add("scale", (sx, sy), scale_matrix(sx, sy))
+
+    def shear_x(self, k_x):
+        return self._add("shear_x", (k_x,), shear_x_matrix(k_x))
+
+    def shear_y(self, k_y):
+        return self._add("shear_y", (k_y,), shear_y_matrix(k_y))
+
+    def rotate(self, angle_deg):
+        return self._add("rotate", (angle_deg,), rotation_matrix(angle_deg))
+
+    def mirror(self, ax, ay):
+        return self._add("mirror", (ax, ay), mirror_matrix(ax, ay))
+
+    def translate(self, tx, ty):
+        return self._add("translate", (tx, ty), translation_matrix(tx, ty))
+
+    def matrix(self):
+        """Returns the fused forward matrix (the last step is the left-most factor)."""
+        M_forward = np.eye(3)
+        for _, _, step_matrix in self.steps:
+            M_forward = step_matrix @ M_forward
+        return M_forward
+
+    def apply(self, image, resample=Image.BICUBIC):
+        """
+        Applies the whole chain with a single resampling pass.
+
+        Args:
+            image (PIL.Image.Image or np.array): Input image. PIL images are resampled with
+                                                 Image.transform, NumPy arrays with warp_affine_array.
+            resample (int): PIL resampling filter (ignored for NumPy input, which is bilinear).
+
+        Returns:
+            PIL.Image.Image or np.array: The transformed image (same type as the input).
+        """
+        start = time.perf_counter()
+        M_forward = self.matrix()
+        composed = time.perf_counter()
+
+        is_pil = isinstance(image, Image.Image)
+        image_size = image.size if is_pil else (image.shape[1], image.shape[0])
+        M_final_forward_to_canvas, (new_width, new_height) = fit_transform_to_canvas(M_forward, image_size)
+        if new_width <= 0 or new_height <= 0:
+            raise ValueError(f"Calculated new image dimensions are non-positive ({new_width}x{new_height}).")
+        bounded = time.perf_counter()
+
+        if is_pil:
+            M_inverse = np.linalg.inv(M_final_forward_to_canvas)
+            result = image.transform((new_width, new_height), Image.AFFINE, tuple(M_inverse[:2].ravel()),
+                                     resample=resample)
+        else:
+            result = warp_affine_array(image, M_final_forward_to_canvas, (new_width, new_height))
+        finished = time.perf_counter()
+
+        self.timings = {
+            'compose': composed - start,
+            'canvas': bounded - composed,
+            'resample': finished - bounded,
+            'total': finished - start,
+        }
+        return result
+
+    def apply_sequential(self, image_pil):
+        """
+        Applies the steps one by one with affine_transform_image (one bicubic resample per step).
+        Provided for comparison with apply(); records the time of each step in self.timings.
+        """
+        self.timings = {}
+        result = image_pil
+        total_start = time.perf_counter()
+        for index, (name, params, _) in enumerate(self.steps):
+            start = time.perf_counter()
+            result = affine_transform_image(result, **_STEP_KEYWORDS[name](*params))
+            self.timings[f"step {index}: {_describe_step(name, params)}"] = time.perf_counter() - start
+        self.timings['total'] = time.perf_counter() - total_start
+        return result
+
+    def __repr__(self):
+        return "TransformChain(" + " -> ".join(_describe_step(name, params) for name, params, _ in self.steps) + ")"
+
+
+def _describe_step(name, params):
+    return f"{name}({', '.join(str(value) for value in params)})"
+
+
+# How each chain step maps onto the keyword arguments of affine_transform_image
+_STEP_KEYWORDS = {
+    "scale": lambda sx, sy: {"scale": (sx, sy)},
+    "shear_x": lambda k_x: {"shear_params": (k_x, 0.0)},
+    "shear_y": lambda k_y: {"shear_params": (0.0, k_y)},
+    "rotate": lambda angle_deg: {"angle_deg": angle_deg},
+    "mirror": lambda ax, ay: {"mirror_scale": (ax, ay)},
+    "translate": lambda tx, ty: {"translate": (tx, ty)},
+}
+
+
+if __name__ == '__main__':
+    # Path to your image file.
+    IMAGE_PATH = "sample_images/foto1.jpeg"
+    try:
+        original_image = Image.open(IMAGE_PATH).convert("RGB")
+
+        # Rotate, then scale, then shear
+        chain = TransformChain().rotate(30.0).scale(0.8, 0.8).shear_x(0.2)
+
+        sequential_img = chain.apply_sequential(original_image)
+        sequential_total = chain.timings['total']
+        print(f"{chain} applied step by step:")
+        for stage, seconds in chain.timings.items():
+            print(f"  {stage}: {seconds * 1000:.1f} ms")
+
+        fused_img = chain.apply(original_image)
+        print(f"{chain} fused into one resample:")
+        for stage, seconds in chain.timings.items():
+            print(f"  {stage}: {seconds * 1000:.1f} ms")
+        print(f"Speed-up: {sequential_total / chain.timings['total']:.1f}x")
+
+        plt.figure(figsize=(18, 6))
+
+        plt.subplot(1, 3, 1)
+        plt.imshow(original_image)
+        plt.title(f"Original Image: {IMAGE_PATH}")
+        plt.axis('off')
+
+        plt.subplot(1, 3, 2)
+        plt.imshow(sequential_img)
+        plt.title(f"Step by step ({len(chain.steps)} resamples)")
+        plt.axis('off')
+
+        plt.subplot(1, 3, 3)
+        plt.imshow(fused_img)
+        plt.title("Fused chain (1 resample)")
+        plt.axis('off')
+
+        plt.tight_layout()
+        plt.show()
+
+    except FileNotFoundError:
+        print(f"Error: The file '{IMAGE_PATH}' was not found. Please check the file path.")
+    except Exception as e:
+        import traceback
+
+        print(f"An unexpected error occurred: {e}")
+        print("--- Traceback ---")
+        traceback.print_exc()
+        print("-----------------")
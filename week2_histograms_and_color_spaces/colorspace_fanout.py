@@ -0,0 +1,145 @@
+import time
+
+import cv2
+import numpy as np
+import matplotlib.pyplot as plt
+from PIL import Image
+
+from create_color_histograms import CHANNEL_LABELS, compute_channel_histograms, load_channel_histograms
+from rgb_to_cmyk_conversion import rgb_to_cmyk_array
+from rgb_to_hsv_conversion import rgb_to_hsv_array
+
+# Products fan_out can compute from one decoded image
+FANOUT_OUTPUTS = ('rgb', 'hsv', 'hsv_float', 'cmyk', 'gray', 'hist')
+
+
+def fan_out(image, outputs=('hsv', 'cmyk', 'gray', 'hist')):
+    """
+    Decodes an image once and derives any subset of color spaces and histograms from it.
+    Shared intermediates are computed once and reused: the RGB buffer feeds HSV and CMYK, the
+    per-pixel channel maximum/minimum feed HSV (V, S, H) and CMYK (K and the ink divisor), and the
+    grayscale plane feeds the histograms.
+
+    Args:
+        image (str or np.array): Path to an image file, or an already decoded uint8 BGR array.
+        outputs (iterable): Any of FANOUT_OUTPUTS:
+            'rgb' (H, W, 3) uint8, 'hsv' (H, W, 3) uint8 (same as PIL convert('HSV')),
+            'hsv_float' (H, W, 3) float32 in [0, 1], 'cmyk' (H, W, 4) uint8 with black generation,
+            'gray' (H, W) uint8, 'hist' (4, 256) float32 B, G, R and grayscale histograms.
+
+    Returns:
+        tuple: (results, timings). `results` maps each requested output to its array;
+               `timings` maps each stage that ran ('decode', 'rgb', 'max_min', then the outputs) to
+               seconds, plus 'total'.
+
+    Raises:
+        FileNotFoundError: If `image` is a path that cannot be opened.
+    """
+    outputs = set(outputs)
+    unknown = outputs.difference(FANOUT_OUTPUTS)
+    if unknown:
+        raise ValueError(f"Unknown outputs {sorted(unknown)}; choose from {FANOUT_OUTPUTS}.")
+
+    timings = {}
+    total_start = time.perf_counter()
+
+    def timed(stage, function, *args, **kwargs):
+        start = time.perf_counter()
+        result = function(*args, **kwargs)
+        timings[stage] = time.perf_counter() - start
+        return result
+
+    def decode(path):
+        bgr = cv2.imread(path)
+        if bgr is None:
+            raise FileNotFoundError(f"Image not found or could not be opened: {path}")
+        return bgr
+
+    bgr = timed('decode', decode, image) if isinstance(image, str) else image
+
+    results = {}
+    rgb = None
+    if outputs & {'rgb', 'hsv', 'hsv_float', 'cmyk'}:
+        rgb = timed('rgb', cv2.cvtColor, bgr, cv2.COLOR_BGR2RGB)
+        if 'rgb' in outputs:
+            results['rgb'] = rgb
+
+    maxc = minc = None
+    if outputs & {'hsv', 'hsv_float', 'cmyk'}:
+        def max_min(planes):
+            return cv2.max(cv2.max(planes[0], planes[1]), planes[2]), cv2.min(cv2.min(planes[0], planes[1]), planes[2])
+
+        maxc, minc = timed('max_min', max_min, cv2.split(bgr))
+
+    if 'hsv' in outputs:
+        results['hsv'] = timed('hsv', rgb_to_hsv_array, rgb, maxc=maxc, minc=minc)
+    if 'hsv_float' in outputs:
+        results['hsv_float'] = timed('hsv_float', rgb_to_hsv_array, rgb, dtype=np.float32, maxc=maxc, minc=minc)
+    if 'cmyk' in outputs:
+        results['cmyk'] = timed('cmyk', rgb_to_cmyk_array, rgb, maxc=maxc)
+
+    gray = None
+    if outputs & {'gray', 'hist'}:
+        gray = timed('gray', cv2.cvtColor, bgr, cv2.COLOR_BGR2GRAY)
+        if 'gray' in outputs:
+            results['gray'] = gray
+    if 'hist' in outputs:
+        results['hist'] = timed('hist', compute_channel_histograms, bgr, gray_image=gray)
+
+    timings['total'] = time.perf_counter() - total_start
+    return results, timings
+
+
+if __name__ == '__main__':
+    # Path to your image file.
+    IMAGE_PATH = "sample_images/foto1.jpeg"
+
+    try:
+        results, timings = fan_out(IMAGE_PATH, outputs=('hsv', 'cmyk', 'gray', 'hist'))
+        print(f"Fan-out from one decode of '{IMAGE_PATH}':")
+        for stage, seconds in timings.items():
+            print(f"  {stage}: {seconds * 1000:.1f} ms")
+
+        # The same products computed the old way, each script re-opening and re-decoding the file
+        start = time.perf_counter()
+        separate_hsv = np.array(Image.open(IMAGE_PATH).convert('RGB').convert('HSV'))
+        separate_cmyk = [np.array(channel) for channel in Image.open(IMAGE_PATH).convert('RGB').convert('CMYK').split()]
+        separate_gray = cv2.imread(IMAGE_PATH, cv2.IMREAD_GRAYSCALE)
+        separate_hist = load_channel_histograms(IMAGE_PATH)
+        print(f"Separate decodes per product: {(time.perf_counter() - start) * 1000:.1f} ms")
+        print(f"HSV identical to PIL: {np.array_equal(results['hsv'], separate_hsv)}")
+
+        plt.figure(figsize=(14, 8))
+
+        plt.subplot(2, 2, 1)
+        plt.imshow(results['hsv'][:, :, 0], cmap='hsv')
+        plt.title('Hue Channel (H)')
+        plt.axis('off')
+
+        plt.subplot(2, 2, 2)
+        plt.imshow(results['cmyk'][:, :, 3], cmap='gray')
+        plt.title('Key/Black Channel (K)')
+        plt.axis('off')
+
+        plt.subplot(2, 2, 3)
+        plt.imshow(results['gray'], cmap='gray')
+        plt.title('Grayscale')
+        plt.axis('off')
+
+        plt.subplot(2, 2, 4)
+        for i, color_name in enumerate(('blue', 'green', 'red', 'gray')):
+            plt.plot(results['hist'][i], color=color_name, label=CHANNEL_LABELS[i])
+        plt.xlim([0, 256])
+        plt.title('Histograms')
+        plt.legend()
+
+        plt.tight_layout()
+        plt.show()
+
+    except FileNotFoundError as fnf_error:
+        print(fnf_error)
+    except Exception as e:
+        import traceback
+
+        print(f"An unexpected error occurred: {e}")
+        traceback.print_exc()
@@ -2,59 +2,80 @@ import cv2  # OpenCV for image processing and histogram calculation
 import numpy as np
 import matplotlib.pyplot as plt
 
-# Path to your image file.
+# Row order of the histogram array returned by compute_channel_histograms
+# OpenCV loads as BGR, so channel 0 is Blue, 1 is Green, 2 is Red; row 3 is the grayscale (luma) histogram.
+CHANNEL_LABELS = ('Blue Channel', 'Green Channel', 'Red Channel', 'Grayscale')
 
 
-IMAGE_PATH = "sample_images/foto1.jpeg"
+def compute_channel_histograms(color_image_bgr, gray_image=None):
+    """
+    Computes the Blue, Green, Red and grayscale histograms of an already decoded BGR image.
+    The grayscale plane is derived from the BGR buffer (cv2.cvtColor) instead of decoding the
+    file a second time, and all four histograms are written into one preallocated array.
+
+    Args:
+        color_image_bgr (np.array): uint8 BGR image of shape (H, W, 3).
+        gray_image (np.array, optional): Precomputed grayscale version of the same image.
+
+    Returns:
+        np.array: float32 array of shape (4, 256): rows are B, G, R and grayscale counts.
+    """
+    if gray_image is None:
+        gray_image = cv2.cvtColor(color_image_bgr, cv2.COLOR_BGR2GRAY)
+
+    histograms = np.empty((4, 256), dtype=np.float32)
+    for channel in range(3):
+        # cv2.calcHist([images], [channels], mask, [histSize], ranges)
+        histograms[channel] = cv2.calcHist([color_image_bgr], [channel], None, [256], [0, 256]).ravel()
+    histograms[3] = cv2.calcHist([gray_image], [0], None, [256], [0, 256]).ravel()
+    return histograms
 
-try:
-    # Load the color image using OpenCV
-    # cv2.imread() loads images in BGR (Blue, Green, Red) order by default.
-    color_image_bgr = cv2.imread(IMAGE_PATH)
 
+def load_channel_histograms(image_path):
+    """
+    Decodes an image file once and returns its (4, 256) B, G, R and grayscale histograms.
+
+    Raises:
+        FileNotFoundError: If the image cannot be opened.
+    """
+    # cv2.imread() loads images in BGR (Blue, Green, Red) order by default.
+    color_image_bgr = cv2.imread(image_path)
     if color_image_bgr is None:
-        raise FileNotFoundError(f"Image not found or could not be opened: {IMAGE_PATH}")
-
-    # Load the image in grayscale using OpenCV
-    # The '0' flag loads the image as grayscale.
-    gray_image = cv2.imread(IMAGE_PATH, 0)
-
-    if gray_image is None:  # Should not happen if color_image_bgr loaded, but good practice
-        raise FileNotFoundError(f"Grayscale image not found or could not be opened: {IMAGE_PATH}")
-
-    # Define colors for plotting each histogram line
-    # OpenCV loads as BGR, so channel 0 is Blue, 1 is Green, 2 is Red.
-    plot_colors = ('blue', 'green', 'red', 'gray')
-    channel_labels = ('Blue Channel', 'Green Channel', 'Red Channel', 'Grayscale')
-
-    plt.figure(figsize=(10, 6))
-    plt.title(f'Color and Grayscale Histograms for {IMAGE_PATH}')
-    plt.xlabel('Pixel Intensity')
-    plt.ylabel('Number of Pixels')
-
-    # Calculate and plot histogram for each color channel (B, G, R)
-    for i, color_name in enumerate(plot_colors):
-        if i < 3:  # For B, G, R channels
-            # cv2.calcHist([images], [channels], mask, [histSize], ranges)
-            # For BGR image: channel 0 is Blue, 1 is Green, 2 is Red
-            histogram = cv2.calcHist([color_image_bgr], [i], None, [256], [0, 256])
-            plt.plot(histogram, color=color_name, label=channel_labels[i])
-            print(f"Calculated histogram for {channel_labels[i]}")
-        elif i == 3:  # For Grayscale
-            histogram = cv2.calcHist([gray_image], [0], None, [256], [0, 256])
-            plt.plot(histogram, color=color_name, label=channel_labels[i])
-            print(f"Calculated histogram for {channel_labels[i]}")
-
-    plt.xlim([0, 256])  # Set x-axis limits for pixel intensity
-    plt.legend()  # Show legend to identify lines
-    plt.grid(True, linestyle='--', alpha=0.7)  # Add a grid for better readability
-    plt.tight_layout()
-    plt.show()
-
-except FileNotFoundError as fnf_error:
-    print(fnf_error)
-except Exception as e:
-    import traceback
-
-    print(f"An unexpected error occurred: {e}")
-    traceback.print_exc()
\ No newline at end of file
+        raise FileNotFoundError(f"Image not found or could not be opened: {image_path}")
+    return compute_channel_histograms(color_image_bgr)
+
+
+if __name__ == '__main__':
+    # Path to your image file.
+    IMAGE_PATH = "sample_images/foto1.jpeg"
+
+    try:
+        # Decode the file once; the grayscale histogram is derived from the same BGR buffer
+        histograms = load_channel_histograms(IMAGE_PATH)
+
+        # Define colors for plotting each histogram line
+        plot_colors = ('blue', 'green', 'red', 'gray')
+
+        plt.figure(figsize=(10, 6))
+        plt.title(f'Color and Grayscale Histograms for {IMAGE_PATH}')
+        plt.xlabel('Pixel Intensity')
+        plt.ylabel('Number of Pixels')
+
+        # Plot the histogram of each color channel (B, G, R) and the grayscale version
+        for i, color_name in enumerate(plot_colors):
+            plt.plot(histograms[i], color=color_name, label=CHANNEL_LABELS[i])
+            print(f"Calculated histogram for {CHANNEL_LABELS[i]}")
+
+        plt.xlim([0, 256])  # Set x-axis limits for pixel intensity
+        plt.legend()  # Show legend to identify lines
+        plt.grid(True, linestyle='--', alpha=0.7)  # Add a grid for better readability
+        plt.tight_layout()
+        plt.show()
+
+    except FileNotFoundError as fnf_error:
+        print(fnf_error)
+    except Exception as e:
+        import traceback
+
+        print(f"An unexpected error occurred: {e}")
+        traceback.print_exc()
@@ -0,0 +1,208 @@
+import time
+
+import cv2  # OpenCV for image loading, min/max and 16-bit CLAHE
+import numpy as np
+import matplotlib.pyplot as plt
+
+from streaming_clahe import clahe_streaming
+
+
+def compact_histogram(image):
+    """
+    Exact histogram of a uint8 or uint16 image over its occupied intensity range only.
+    A 16-bit frame has 65536 possible levels, but a 12-bit sensor (or a dim exposure) uses far
+    fewer; only the bins between the minimum and maximum value are materialized.
+
+    Args:
+        image (np.array): uint8 or uint16 grayscale image.
+
+    Returns:
+        tuple: (counts, low) where counts[i] is the number of pixels with value low + i.
+    """
+    if image.dtype not in (np.uint8, np.uint16):
+        raise ValueError("Expected a uint8 or uint16 image.")
+    low, high, _, _ = cv2.minMaxLoc(image)
+    low, high = int(low), int(high)
+    values = image.ravel()
+    if low > high - low:  # The offset dominates: shift so the bincount only spans [low, high]
+        values = cv2.subtract(image, low).ravel()
+        return np.bincount(values, minlength=high - low + 1), low
+    return np.bincount(values, minlength=high + 1)[low:], low
+
+
+def binned_histogram(image, max_bins=1024):
+    """
+    Histogram with adaptive binning: one bin per level when the occupied range fits in `max_bins`,
+    otherwise the narrowest integer bin width that does. Bins are summed from compact_histogram,
+    so the pixels are read only once.
+
+    Args:
+        image (np.array): uint8 or uint16 grayscale image.
+        max_bins (int): Maximum number of bins.
+
+    Returns:
+        tuple: (counts, edges) with len(edges) == len(counts) + 1, as in np.histogram.
+    """
+    counts, low = compact_histogram(image)
+    width = -(-len(counts) // max_bins)  # Ceiling division
+    starts = np.arange(0, len(counts), width)
+    edges = np.append(low + starts, low + len(counts))
+    return np.add.reduceat(counts, starts), edges
+
+
+def _output_max(image, bit_depth):
+    dtype_bits = 8 * image.dtype.itemsize
+    if bit_depth is None:
+        bit_depth = dtype_bits
+    elif not 1 <= bit_depth <= dtype_bits:
+        raise ValueError(f"bit_depth must be between 1 and {dtype_bits} for {image.dtype} images, got {bit_depth}.")
+    return (1 << bit_depth) - 1
+
+
+def equalize_hist_16(image, bit_depth=None):
+    """
+    Histogram equalization for uint8/uint16 images without downcasting.
+    Uses the cv2.equalizeHist mapping (levels up to the lowest occupied one map to 0, the rest follow
+    the CDF, scaled and rounded in float32 as OpenCV does) over the occupied range, so the CDF costs
+    scale with the dynamic range, not with 65536. 8-bit input with an 8-bit output goes straight to
+    cv2.equalizeHist.
+
+    Args:
+        image (np.array): uint8 or uint16 grayscale image.
+        bit_depth (int, optional): Output range 0 .. 2**bit_depth - 1 (defaults to the dtype's full range,
+                                   e.g. pass 12 to keep 12-bit data 12-bit); at most the dtype's width.
+
+    Returns:
+        np.array: Equalized image with the input dtype.
+    """
+    out_max = _output_max(image, bit_depth)
+    if image.dtype == np.uint8 and out_max == 255:
+        return cv2.equalizeHist(image)
+    counts, low = compact_histogram(image)
+    high = low + len(counts) - 1
+
+    lut = np.zeros(high + 1, dtype=image.dtype)  # Indexed directly by pixel value
+    if counts[0] == image.size:  # Single intensity
+        lut[low] = low
+    else:
+        cdf = np.cumsum(counts[1:]).astype(np.float32)
+        scale = np.float32(out_max) / np.float32(image.size - counts[0])
+        lut[low + 1:] = np.clip(np.rint(cdf * scale), 0, out_max).astype(image.dtype)
+    return lut[image]
+
+
+def clahe_16(image, clip_limit=2.0, tile_grid_size=(8, 8), bit_depth=None, occupied_range=True):
+    """
+    CLAHE for uint16 (or uint8) images without downcasting, with 2**bit_depth histogram bins.
+    OpenCV's CLAHE on CV_16U always uses 65536 bins and a clip limit of clip_limit * tileArea / 65536,
+    which clips nearly everything on 12-bit data and leaves it almost unchanged. Here the bins match
+    `bit_depth`: for a depth below the dtype's, OpenCV's algorithm runs with 2**bit_depth bins
+    (streaming_clahe). With `occupied_range`, the bins cover only the frame's [min, max] range (its
+    levels are first remapped linearly onto 0 .. 2**bit_depth - 1), so a dim 12-bit frame is spread
+    over the whole 12-bit output range.
+
+    Args:
+        image (np.array): uint8 or uint16 grayscale image.
+        clip_limit (float): Contrast limit, as in cv2.createCLAHE (relative to 2**bit_depth bins).
+        tile_grid_size (tuple): Tile grid, as in cv2.createCLAHE.
+        bit_depth (int, optional): Bit depth of the data and the output (defaults to the dtype's full range;
+                                   pass the sensor's depth, e.g. 12, for 12-bit frames); at most the
+                                   dtype's width. Larger pixel values are clipped to 2**bit_depth - 1.
+        occupied_range (bool): Bin the occupied range only. With False the result equals OpenCV's CLAHE
+                               at 2**bit_depth bins (cv2.createCLAHE itself for the dtype's full depth).
+
+    Returns:
+        np.array: CLAHE result with the input dtype, in 0 .. 2**bit_depth - 1.
+    """
+    out_max = _output_max(image, bit_depth)
+    data = np.minimum(image, out_max) if out_max < _output_max(image, None) else image
+    if occupied_range:
+        low, high, _, _ = cv2.minMaxLoc(data)
+        low, high = int(low), int(high)
+        if high > low:
+            levels = np.arange(high + 1, dtype=np.float64) - low
+            remap = np.rint(np.clip(levels, 0, None) * (out_max / (high - low))).astype(image.dtype)
+            data = remap[data]
+    if out_max == _output_max(image, None):
+        return cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=tile_grid_size).apply(data)
+    return clahe_streaming(data, clip_limit=clip_limit, tile_grid_size=tile_grid_size,
+                           bit_depth=out_max.bit_length())
+
+
+if __name__ == '__main__':
+    # Path to your image file (a synthetic 12-bit sensor frame is generated from it).
+    IMAGE_PATH = "sample_images/foto1.jpeg"
+
+    try:
+        gray_image = cv2.imread(IMAGE_PATH, 0)
+        if gray_image is None:
+            raise FileNotFoundError(f"Image not found or could not be opened: {IMAGE_PATH}")
+
+        # Simulate a low-contrast 12-bit frame: signal in roughly 1000..2000 plus sensor noise
+        rng = np.random.default_rng(0)
+        frame_12bit = (1000 + gray_image.astype(np.float64) * 4 + rng.normal(0, 3, gray_image.shape))
+        frame_12bit = np.clip(frame_12bit, 0, 4095).astype(np.uint16)
+
+        counts, low = compact_histogram(frame_12bit)
+        print(f"Occupied range {low}..{low + len(counts) - 1}: {len(counts)} bins instead of 65536")
+
+        # Old workflow: downcast to 8 bits first, then equalize
+        start = time.perf_counter()
+        downcast_equalized = cv2.equalizeHist((frame_12bit >> 4).astype(np.uint8))
+        downcast_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        equalized = equalize_hist_16(frame_12bit, bit_depth=12)
+        direct_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        clahe_image = clahe_16(frame_12bit, bit_depth=12)
+        clahe_seconds = time.perf_counter() - start
+
+        print(f"Downcast + equalizeHist: {downcast_seconds * 1000:.1f} ms, "
+              f"{len(np.unique(downcast_equalized))} output levels")
+        print(f"12-bit equalization: {direct_seconds * 1000:.1f} ms, {len(np.unique(equalized))} output levels")
+        print(f"12-bit CLAHE: {clahe_seconds * 1000:.1f} ms, output levels {clahe_image.min()}..{clahe_image.max()}")
+        # Both 12-bit results must use the 12-bit output range, not stay near the input's 1000..2000
+        for name, result in (('equalization', equalized), ('CLAHE', clahe_image)):
+            if result.max() > 4095 or result.max() - result.min() < 0.9 * 4095:
+                raise ValueError(f"12-bit {name} output spans only {result.min()}..{result.max()} of 0..4095.")
+
+        plt.figure(figsize=(15, 9))
+
+        plt.subplot(2, 3, 1)
+        plt.imshow(frame_12bit, cmap='gray', vmin=0, vmax=4095)
+        plt.title('12-bit Frame')
+        plt.axis('off')
+
+        plt.subplot(2, 3, 2)
+        plt.imshow(equalized, cmap='gray', vmin=0, vmax=4095)
+        plt.title('12-bit Equalization')
+        plt.axis('off')
+
+        plt.subplot(2, 3, 3)
+        plt.imshow(clahe_image, cmap='gray', vmin=0, vmax=4095)
+        plt.title('12-bit CLAHE')
+        plt.axis('off')
+
+        for position, (data, title) in enumerate([(frame_12bit, 'Original Histogram'),
+                                                  (equalized, 'Equalized Histogram'),
+                                                  (clahe_image, 'CLAHE Histogram')], start=4):
+            hist, edges = binned_histogram(data, max_bins=512)
+            plt.subplot(2, 3, position)
+            plt.stairs(hist, edges, color='black')
+            plt.title(f'{title} ({len(hist)} bins)')
+            plt.xlabel('Pixel Intensity')
+            plt.ylabel('Number of Pixels')
+            plt.grid(True, linestyle='--', alpha=0.7)
+
+        plt.tight_layout()
+        plt.show()
+
+    except FileNotFoundError as fnf_error:
+        print(fnf_error)
+    except Exception as e:
+        import traceback
+
+        print(f"An unexpected error occurred: {e}")
+        traceback.print_exc()
@@ -0,0 +1,181 @@
+import os
+import time
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from rgb_to_hsv_conversion import rgb_to_hsv_array
+
+
+class JointHistogram:
+    """
+    Binned joint 3-D color histogram.
+    Stored sparsely as sorted (index, count) pairs of the occupied bins when fewer than half the
+    bins are occupied, densely otherwise. A bin index packs the quantized channel values as
+    (q0 * bins[1] + q1) * bins[2] + q2.
+    """
+
+    def __init__(self, bins, indices=None, counts=None, dense=None):
+        self.bins = tuple(bins)
+        self.size = int(np.prod(self.bins))
+        if dense is not None:
+            dense = np.asarray(dense, dtype=np.int64).ravel()
+            if len(dense) != self.size:
+                raise ValueError(f"Dense counts must have {self.size} entries.")
+            occupied = np.flatnonzero(dense)
+            if 2 * len(occupied) < self.size:
+                indices, counts, dense = occupied.astype(np.int32), dense[occupied], None
+        self.dense = dense
+        self.indices = None if indices is None else np.asarray(indices, dtype=np.int32)
+        self.counts = None if counts is None else np.asarray(counts, dtype=np.int64)
+        if self.dense is None and (self.indices is None or self.counts is None):
+            raise ValueError("Provide either dense counts or sparse indices and counts.")
+
+    @property
+    def is_sparse(self):
+        return self.dense is None
+
+    @property
+    def occupied(self):
+        return len(self.indices) if self.is_sparse else int(np.count_nonzero(self.dense))
+
+    @property
+    def total(self):
+        return int(self.counts.sum() if self.is_sparse else self.dense.sum())
+
+    @property
+    def nbytes(self):
+        return self.indices.nbytes + self.counts.nbytes if self.is_sparse else self.dense.nbytes
+
+    def sparse_pairs(self):
+        """Returns (indices, counts) of the occupied bins, sorted by index."""
+        if self.is_sparse:
+            return self.indices, self.counts
+        occupied = np.flatnonzero(self.dense)
+        return occupied.astype(np.int32), self.dense[occupied]
+
+    def to_dense(self):
+        """Returns the counts as a dense array of shape `bins`."""
+        if not self.is_sparse:
+            return self.dense.reshape(self.bins)
+        dense = np.zeros(self.size, dtype=np.int64)
+        dense[self.indices] = self.counts
+        return dense.reshape(self.bins)
+
+    def __repr__(self):
+        storage = "sparse" if self.is_sparse else "dense"
+        return (f"JointHistogram(bins={self.bins}, occupied={self.occupied}/{self.size}, "
+                f"{storage}, {self.nbytes} bytes)")
+
+
+def joint_histogram(rgb, bins=32, color_space='rgb'):
+    """
+    Computes the joint color histogram of an image with a single np.bincount.
+    Each channel is quantized to bins[c] levels (value * bins[c] // 256), the three levels are
+    packed into one integer index and all pixels are counted in one pass.
+
+    Args:
+        rgb (np.array): uint8 RGB image (H, W, 3).
+        bins (int or tuple): Number of bins per channel, e.g. 32 or (16, 4, 4).
+        color_space (str): 'rgb', or 'hsv' to bin the HSV values of rgb_to_hsv_array.
+
+    Returns:
+        JointHistogram: Sparse when fewer than half of the bins are occupied.
+    """
+    bins = (bins,) * 3 if np.isscalar(bins) else tuple(bins)
+    if any(not 1 <= b <= 256 for b in bins):
+        raise ValueError("Bins per channel must be between 1 and 256.")
+    if color_space == 'hsv':
+        pixels = rgb_to_hsv_array(rgb)
+    elif color_space == 'rgb':
+        pixels = np.asarray(rgb)
+    else:
+        raise ValueError("color_space must be 'rgb' or 'hsv'.")
+
+    pixels = pixels.reshape(-1, 3)
+    index = (pixels[:, 0].astype(np.int32) * bins[0]) >> 8
+    for channel in (1, 2):
+        index *= bins[channel]
+        index += (pixels[:, channel].astype(np.int32) * bins[channel]) >> 8
+    return JointHistogram(bins, dense=np.bincount(index, minlength=int(np.prod(bins))))
+
+
+def _shared_bins(hist_a, hist_b):
+    """Probabilities of the bins occupied in both histograms (the only bins the distances below need)."""
+    if hist_a.bins != hist_b.bins:
+        raise ValueError("Histograms must use the same binning.")
+    indices_a, counts_a = hist_a.sparse_pairs()
+    indices_b, counts_b = hist_b.sparse_pairs()
+    if counts_a.sum() == 0 or counts_b.sum() == 0:
+        raise ValueError("Cannot normalize an empty histogram (all counts are zero).")
+    _, in_a, in_b = np.intersect1d(indices_a, indices_b, assume_unique=True, return_indices=True)
+    return counts_a[in_a] / counts_a.sum(), counts_b[in_b] / counts_b.sum()
+
+
+def histogram_intersection(hist_a, hist_b):
+    """Swain-Ballard intersection of the normalized histograms: 1 for identical, 0 for disjoint."""
+    p, q = _shared_bins(hist_a, hist_b)
+    return float(np.minimum(p, q).sum())
+
+
+def l1_distance(hist_a, hist_b):
+    """Sum of |p - q| over all bins (0..2), computed as 2 - 2 * intersection."""
+    return 2.0 - 2.0 * histogram_intersection(hist_a, hist_b)
+
+
+def chi_square_distance(hist_a, hist_b):
+    """
+    Symmetric chi-square distance sum((p - q)^2 / (p + q)) over all bins (0..2).
+    Over the union of bins this equals 2 - 4 * sum(p * q / (p + q)), which only involves shared bins.
+    """
+    p, q = _shared_bins(hist_a, hist_b)
+    return float(2.0 - 4.0 * (p * q / (p + q)).sum())
+
+
+def bhattacharyya_distance(hist_a, hist_b):
+    """Hellinger form sqrt(1 - sum(sqrt(p * q))) used by cv2.compareHist(HISTCMP_BHATTACHARYYA)."""
+    p, q = _shared_bins(hist_a, hist_b)
+    return float(np.sqrt(max(1.0 - np.sqrt(p * q).sum(), 0.0)))
+
+
+if __name__ == '__main__':
+    # Directory whose images are compared with the query image
+    IMAGE_DIR = "sample_images"
+    QUERY_IMAGE = "foto1.jpeg"
+
+    try:
+        paths = sorted(os.path.join(IMAGE_DIR, name) for name in os.listdir(IMAGE_DIR)
+                       if name.lower().endswith(('.jpg', '.jpeg', '.png')))
+        images = {os.path.basename(path): np.asarray(Image.open(path).convert('RGB')) for path in paths}
+        if QUERY_IMAGE not in images:
+            raise FileNotFoundError(f"Query image not found: {os.path.join(IMAGE_DIR, QUERY_IMAGE)}")
+
+        for bins in (32, 64):
+            start = time.perf_counter()
+            histograms = {name: joint_histogram(image, bins) for name, image in images.items()}
+            elapsed = time.perf_counter() - start
+            query = histograms[QUERY_IMAGE]
+            print(f"{bins}^3 RGB bins: {len(images)} histograms in {elapsed * 1000:.1f} ms, query {query}")
+
+            # Sanity check against OpenCV's dense 3-D calcHist
+            reference = cv2.calcHist([images[QUERY_IMAGE]], [0, 1, 2], None, [bins] * 3, [0, 256] * 3)
+            print(f"  matches cv2.calcHist: {np.array_equal(query.to_dense(), reference.astype(np.int64))}")
+
+            ranking = sorted(histograms, key=lambda name: chi_square_distance(query, histograms[name]))
+            for name in ranking:
+                candidate = histograms[name]
+                print(f"  {name}: intersection {histogram_intersection(query, candidate):.3f}, "
+                      f"chi-square {chi_square_distance(query, candidate):.3f}, "
+                      f"Bhattacharyya {bhattacharyya_distance(query, candidate):.3f}")
+
+        hsv_histogram = joint_histogram(images[QUERY_IMAGE], bins=(16, 4, 4), color_space='hsv')
+        print(f"HSV (16, 4, 4) histogram of the query: {hsv_histogram}")
+
+    except FileNotFoundError as fnf_error:
+        print(fnf_error)
+    except Exception as e:
+        import traceback
+
+        print(f"An unexpected error occurred: {e}")
+        traceback.print_exc()
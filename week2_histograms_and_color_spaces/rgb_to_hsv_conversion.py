@@ -1,70 +1,215 @@
+import time
+
 from PIL import Image
 import numpy as np
 import matplotlib.pyplot as plt
 
-# Path to your image file.
-IMAGE_PATH = "sample_images/foto1.jpeg"
-
-try:
-    # Load the RGB image using Pillow
-    rgb_image = Image.open(IMAGE_PATH).convert('RGB')  # Ensure it's in RGB mode
-
-    if rgb_image is None:
-        raise FileNotFoundError(f"Image not found or could not be opened: {IMAGE_PATH}")
-
-    # --- Convert RGB to HSV using Pillow ---
-    # Pillow's convert method makes this very easy!
-    hsv_image = rgb_image.convert('HSV')
-
-    # --- Separate HSV channels for visualization ---
-    # Although we have the hsv_image object, visualizing its channels requires
-    # splitting them. We can convert to numpy array first for easier splitting.
-    hsv_array = np.array(hsv_image)
-
-    # H channel (Hue) - Represents the color type
-    h_channel = hsv_array[:, :, 0]
-    # S channel (Saturation) - Represents the color purity/intensity
-    s_channel = hsv_array[:, :, 1]
-    # V channel (Value) - Represents the brightness
-    v_channel = hsv_array[:, :, 2]
-
-    print(f"Converted '{IMAGE_PATH}' from RGB to HSV color space.")
-    print(f"Image dimensions (H, W, Channels): {hsv_array.shape}")
-
-    # --- Display results using Matplotlib in a 2x2 grid ---
-    plt.figure(figsize=(10, 10))
-
-    # 1. Original RGB Image
-    plt.subplot(2, 2, 1)
-    plt.imshow(rgb_image)  # Display original RGB
-    plt.title('Original RGB Image')
-    plt.axis('off')
-
-    # 2. Hue Channel (H)
-    plt.subplot(2, 2, 2)
-    plt.imshow(h_channel, cmap='hsv')  # Use 'hsv' colormap for Hue visualization
-    plt.title('Hue Channel (H)')
-    plt.axis('off')
-
-    # 3. Saturation Channel (S)
-    plt.subplot(2, 2, 3)
-    plt.imshow(s_channel, cmap='gray')  # Saturation is often viewed as grayscale intensity
-    plt.title('Saturation Channel (S)')
-    plt.axis('off')
-
-    # 4. Value Channel (V)
-    plt.subplot(2, 2, 4)
-    plt.imshow(v_channel, cmap='gray')  # Value (brightness) is also viewed as grayscale
-    plt.title('Value Channel (V)')
-    plt.axis('off')
-
-    plt.tight_layout()  # Adjust layout
-    plt.show()  # Display the figure
-
-except FileNotFoundError as fnf_error:
-    print(fnf_error)
-except Exception as e:
-    import traceback
-
-    print(f"An unexpected error occurred: {e}")
-    traceback.print_exc()
\ No newline at end of file
+# Reciprocal tables for the float path: 1/chroma and 1/max for every possible uint8 value (0 maps to 0)
+_RECIPROCALS = np.zeros(256, dtype=np.float32)
+_RECIPROCALS[1:] = np.float32(1.0) / np.arange(1, 256, dtype=np.float32)
+
+# Pixels converted per chunk; keeps the int32 temporaries of a chunk in the CPU cache
+CHUNK_PIXELS = 1 << 15
+
+_HUE_LUT = None  # Built lazily by _build_uint8_luts()
+_SATURATION_LUT = None
+
+
+def _build_uint8_luts():
+    """
+    Precomputes the uint8 hue and saturation tables, reproducing Pillow's convert('HSV') arithmetic
+    (float32 divisions, double-precision hue wrap, truncation to 0..255).
+
+    Hue depends only on which channel is the maximum (branch 0/1/2 for R/G/B), the chroma
+    (max - min) and the signed difference of the other two channels, so it fits a (3, 256, 511) table.
+    Saturation depends only on (max, chroma), a (256, 256) table.
+    """
+    global _HUE_LUT, _SATURATION_LUT
+    if _HUE_LUT is not None:
+        return
+
+    chroma = np.arange(256, dtype=np.int64)[:, np.newaxis]
+    diff = np.arange(-255, 256, dtype=np.int64)[np.newaxis, :]
+    valid = (chroma > 0) & (np.abs(diff) <= chroma)
+    safe_chroma = np.maximum(chroma, 1).astype(np.float32)
+
+    # The branch's hue is base + c_first - c_second with c = (max - channel) / chroma in float32;
+    # whichever of the two other channels is the minimum contributes exactly 1.0.
+    c_first = np.where(diff >= 0, np.float32(1.0), (chroma + diff).astype(np.float32) / safe_chroma)
+    c_second = np.where(diff >= 0, (chroma - diff).astype(np.float32) / safe_chroma, np.float32(1.0))
+
+    hue_lut = np.zeros((3, 256, 511), dtype=np.uint8)
+    for branch, base in enumerate((0.0, 2.0, 4.0)):
+        if base == 0.0:
+            h = (c_first - c_second).astype(np.float32)
+        else:
+            h = ((base + c_first.astype(np.float64)) - c_second.astype(np.float64)).astype(np.float32)
+        h = np.fmod(h.astype(np.float64) / 6.0 + 1.0, 1.0).astype(np.float32)
+        hue = np.clip((h.astype(np.float64) * 255.0).astype(np.int64), 0, 255)
+        hue_lut[branch] = np.where(valid, hue, 0)
+
+    max_values = np.arange(256, dtype=np.float32)[:, np.newaxis]
+    chroma_values = np.arange(256, dtype=np.float32)[np.newaxis, :]
+    s = chroma_values / np.maximum(max_values, np.float32(1.0))
+    saturation = np.clip((s.astype(np.float64) * 255.0).astype(np.int64), 0, 255)
+    _SATURATION_LUT = np.where(chroma_values <= max_values, saturation, 0).astype(np.uint8)
+    _HUE_LUT = hue_lut
+
+
+def rgb_to_hsv_array(rgb, out=None, dtype=np.uint8, maxc=None, minc=None, chunk_pixels=CHUNK_PIXELS):
+    """
+    Converts uint8 RGB pixels to HSV without going through PIL.
+
+    uint8 output is identical to np.array(Image.fromarray(rgb).convert('HSV')) and is produced by
+    table lookups (no per-pixel division). float32 output holds H in [0, 1), S and V in [0, 1],
+    computed with reciprocal tables. Pixels are processed in chunks so temporaries stay in cache.
+
+    Args:
+        rgb (np.array): uint8 array of shape (..., 3), e.g. (H, W, 3) or (N, H, W, 3).
+        out (np.array, optional): Preallocated C-contiguous output of the same shape and the requested dtype.
+        dtype: np.uint8 or np.float32.
+        maxc, minc (np.array, optional): Per-pixel channel maximum/minimum (shape rgb.shape[:-1]),
+                                         if already computed.
+        chunk_pixels (int): Number of pixels converted per chunk.
+
+    Returns:
+        np.array: HSV array of shape rgb.shape (`out` if given).
+    """
+    rgb = np.asarray(rgb)
+    dtype = np.dtype(dtype)
+    if rgb.dtype != np.uint8 or rgb.shape[-1] != 3:
+        raise ValueError("Expected a uint8 array with 3 channels in the last axis.")
+    if dtype not in (np.uint8, np.float32):
+        raise ValueError("dtype must be np.uint8 or np.float32.")
+    if out is None:
+        out = np.empty(rgb.shape, dtype=dtype)
+    elif out.shape != rgb.shape or out.dtype != dtype or not out.flags.c_contiguous:
+        raise ValueError(f"out must be a C-contiguous array of shape {rgb.shape} and dtype {dtype}.")
+    if dtype == np.uint8:
+        _build_uint8_luts()
+
+    pixels = rgb.reshape(-1, 3)
+    out_pixels = out.reshape(-1, 3)
+    max_flat = None if maxc is None else np.asarray(maxc).reshape(-1)
+    min_flat = None if minc is None else np.asarray(minc).reshape(-1)
+    for start in range(0, len(pixels), chunk_pixels):
+        stop = start + chunk_pixels
+        _hsv_chunk(pixels[start:stop], out_pixels[start:stop],
+                   None if max_flat is None else max_flat[start:stop],
+                   None if min_flat is None else min_flat[start:stop])
+    return out
+
+
+def _hsv_chunk(pixels, out_pixels, maxc, minc):
+    """Converts one (n, 3) chunk of RGB pixels into out_pixels (uint8 or float32)."""
+    r = pixels[:, 0].astype(np.int32)
+    g = pixels[:, 1].astype(np.int32)
+    b = pixels[:, 2].astype(np.int32)
+    maxc = np.maximum(np.maximum(r, g), b) if maxc is None else maxc.astype(np.int32)
+    minc = np.minimum(np.minimum(r, g), b) if minc is None else minc.astype(np.int32)
+    chroma = maxc - minc
+
+    # Which channel holds the maximum (R wins ties, then G), and the signed difference of the other two
+    not_red = r != maxc
+    blue_max = not_red & (g != maxc)
+    diff = np.where(blue_max, r - g, np.where(not_red, b - r, g - b))
+    branch = not_red.astype(np.int32) + blue_max
+
+    if out_pixels.dtype == np.uint8:
+        out_pixels[:, 0] = _HUE_LUT.ravel()[(branch * 256 + chroma) * 511 + diff + 255]
+        out_pixels[:, 1] = _SATURATION_LUT.ravel()[maxc * 256 + chroma]
+        out_pixels[:, 2] = maxc
+    else:
+        hue = (branch * np.float32(2.0) + diff * _RECIPROCALS[chroma]) / np.float32(6.0)
+        hue[hue < 0] += np.float32(1.0)
+        out_pixels[:, 0] = hue
+        out_pixels[:, 1] = chroma * _RECIPROCALS[maxc]
+        out_pixels[:, 2] = maxc * np.float32(1.0 / 255.0)
+
+
+def rgb_to_hsv_batch(rgb_batch, out=None, dtype=np.uint8):
+    """
+    Converts a batch of RGB images (N, H, W, 3) to HSV in one vectorized call.
+
+    Args:
+        rgb_batch (np.array): uint8 array of shape (N, H, W, 3).
+        out (np.array, optional): Preallocated (N, H, W, 3) output.
+        dtype: np.uint8 or np.float32.
+
+    Returns:
+        np.array: HSV batch of shape (N, H, W, 3).
+    """
+    if np.ndim(rgb_batch) != 4:
+        raise ValueError("Expected a batch of shape (N, H, W, 3).")
+    return rgb_to_hsv_array(rgb_batch, out=out, dtype=dtype)
+
+
+if __name__ == '__main__':
+    # Path to your image file.
+    IMAGE_PATH = "sample_images/foto1.jpeg"
+
+    try:
+        # Load the RGB image using Pillow
+        rgb_image = Image.open(IMAGE_PATH).convert('RGB')  # Ensure it's in RGB mode
+        rgb_array = np.asarray(rgb_image)
+
+        # --- Convert RGB to HSV directly on the NumPy array ---
+        hsv_array = np.empty_like(rgb_array)
+        start = time.perf_counter()
+        rgb_to_hsv_array(rgb_array, out=hsv_array)
+        numpy_seconds = time.perf_counter() - start
+
+        # Reference: Pillow's convert method followed by a copy into NumPy
+        start = time.perf_counter()
+        pil_hsv_array = np.array(rgb_image.convert('HSV'))
+        pil_seconds = time.perf_counter() - start
+        print(f"NumPy HSV: {numpy_seconds * 1000:.1f} ms, PIL convert('HSV') + copy: {pil_seconds * 1000:.1f} ms, "
+              f"identical: {np.array_equal(hsv_array, pil_hsv_array)}")
+
+        # H channel (Hue) - Represents the color type
+        h_channel = hsv_array[:, :, 0]
+        # S channel (Saturation) - Represents the color purity/intensity
+        s_channel = hsv_array[:, :, 1]
+        # V channel (Value) - Represents the brightness
+        v_channel = hsv_array[:, :, 2]
+
+        print(f"Converted '{IMAGE_PATH}' from RGB to HSV color space.")
+        print(f"Image dimensions (H, W, Channels): {hsv_array.shape}")
+
+        # --- Display results using Matplotlib in a 2x2 grid ---
+        plt.figure(figsize=(10, 10))
+
+        # 1. Original RGB Image
+        plt.subplot(2, 2, 1)
+        plt.imshow(rgb_image)  # Display original RGB
+        plt.title('Original RGB Image')
+        plt.axis('off')
+
+        # 2. Hue Channel (H)
+        plt.subplot(2, 2, 2)
+        plt.imshow(h_channel, cmap='hsv')  # Use 'hsv' colormap for Hue visualization
+        plt.title('Hue Channel (H)')
+        plt.axis('off')
+
+        # 3. Saturation Channel (S)
+        plt.subplot(2, 2, 3)
+        plt.imshow(s_channel, cmap='gray')  # Saturation is often viewed as grayscale intensity
+        plt.title('Saturation Channel (S)')
+        plt.axis('off')
+
+        # 4. Value Channel (V)
+        plt.subplot(2, 2, 4)
+        plt.imshow(v_channel, cmap='gray')  # Value (brightness) is also viewed as grayscale
+        plt.title('Value Channel (V)')
+        plt.axis('off')
+
+        plt.tight_layout()  # Adjust layout
+        plt.show()  # Display the figure
+
+    except FileNotFoundError as fnf_error:
+        print(fnf_error)
+    except Exception as e:
+        import traceback
+
+        print(f"An unexpected error occurred: {e}")
+        traceback.print_exc()
@@ -0,0 +1,236 @@
+import os
+import tempfile
+import time
+
+import cv2  # OpenCV for image loading and the in-memory CLAHE reference
+import numpy as np
+import matplotlib.pyplot as plt
+
+HIST_SIZE = 256
+
+
+def clahe_tile_geometry(image_shape, tile_grid_size=(8, 8)):
+    """
+    Tile size used by cv2.createCLAHE(...).apply for an image of this shape.
+    When the image is not divisible by the grid, OpenCV pads it (BORDER_REFLECT_101) by
+    `tiles - (size % tiles)` rows and columns before computing the tile LUTs.
+
+    Args:
+        image_shape (tuple): (height, width) of the image.
+        tile_grid_size (tuple): (tiles_x, tiles_y), as in cv2.createCLAHE.
+
+    Returns:
+        tuple: (tile_height, tile_width)
+    """
+    height, width = image_shape[:2]
+    tiles_x, tiles_y = tile_grid_size
+    if width % tiles_x == 0 and height % tiles_y == 0:
+        return height // tiles_y, width // tiles_x
+    padded_height = height + tiles_y - height % tiles_y
+    padded_width = width + tiles_x - width % tiles_x
+    return padded_height // tiles_y, padded_width // tiles_x
+
+
+def _reflect_101(indices, size):
+    """Maps indices past the end of an axis back inside it (BORDER_REFLECT_101: ..., n-3, n-2 | n-1 | n-2, n-3, ...)."""
+    return np.where(indices < size, indices, 2 * (size - 1) - indices)
+
+
+def _tile_row_luts(tile_rows_pixels, tiles_x, tile_width, clip_limit, hist_size=HIST_SIZE):
+    """
+    Builds the clipped-histogram LUTs of one row of tiles, exactly as OpenCV's CLAHE does.
+
+    Args:
+        tile_rows_pixels (np.array): Pixels of the tile row (values < hist_size),
+                                     shape (tile_height, tiles_x * tile_width).
+        tiles_x (int): Number of tiles across.
+        tile_width (int): Tile width in pixels.
+        clip_limit (int): Integer clip limit per bin (0 disables clipping).
+        hist_size (int): Number of histogram bins (256 for 8-bit data, 2**bit_depth in general).
+
+    Returns:
+        np.array: LUTs of shape (tiles_x, hist_size), uint8 for 256 bins and uint16 above.
+    """
+    tile_height = tile_rows_pixels.shape[0]
+    tile_index = (np.arange(tiles_x * tile_width) // tile_width).astype(np.int64) * hist_size
+    flat_index = (tile_rows_pixels.astype(np.int64) + tile_index).ravel()
+    hist = np.bincount(flat_index, minlength=tiles_x * hist_size).reshape(tiles_x, hist_size)
+
+    if clip_limit > 0:
+        clipped = np.maximum(hist - clip_limit, 0).sum(axis=1, keepdims=True)
+        np.minimum(hist, clip_limit, out=hist)
+        redist_batch = clipped // hist_size
+        residual = clipped - redist_batch * hist_size
+        hist += redist_batch
+
+        # The residual is spread over bins 0, step, 2*step, ... (one count each, `residual` bins in total)
+        residual_step = np.maximum(hist_size // np.maximum(residual, 1), 1)
+        bins = np.arange(hist_size)
+        hist += ((bins % residual_step == 0) & (bins // residual_step < residual)).astype(hist.dtype)
+
+    lut_scale = np.float32(hist_size - 1) / np.float32(tile_height * tile_width)
+    lut = np.cumsum(hist, axis=1).astype(np.float32) * lut_scale
+    return np.clip(np.rint(lut), 0, hist_size - 1).astype(np.uint8 if hist_size <= 256 else np.uint16)
+
+
+def iter_clahe_bands(source, clip_limit=2.0, tile_grid_size=(8, 8), tile_size=None, bit_depth=8):
+    """
+    Streams CLAHE over a tall grayscale image, yielding the output band by band.
+    Only one row of tiles is read at a time to build LUTs, and at most the two neighboring LUT rows
+    needed for bilinear blending are kept, so memory depends on the tile height and image width,
+    not on the image height. With the tile geometry of cv2.createCLAHE(clip_limit, tile_grid_size)
+    the output is identical to the in-memory result (for uint16 data with bit_depth=16 as well).
+    Other bit depths run the same algorithm with 2**bit_depth bins.
+
+    Args:
+        source (np.array or np.memmap): uint8 or uint16 image of shape (H, W), all values below
+                                        2**bit_depth; only row slices are read.
+        clip_limit (float): Contrast limit, as in cv2.createCLAHE.
+        tile_grid_size (tuple): (tiles_x, tiles_y) grid, as in cv2.createCLAHE.
+        tile_size (tuple, optional): (tile_height, tile_width) in pixels. Use this instead of a grid
+                                     for images whose height is not known to fit in memory; memory
+                                     then stays flat as the height grows.
+        bit_depth (int): Bit depth of the data; the histograms have 2**bit_depth bins and the
+                         output spans 0 .. 2**bit_depth - 1.
+
+    Yields:
+        tuple: (row_start, band) where band holds the output rows starting at row_start
+               (uint8 for bit_depth <= 8, uint16 above).
+    """
+    hist_size = 1 << bit_depth
+    height, width = source.shape[:2]
+    if tile_size is None:
+        tile_height, tile_width = clahe_tile_geometry((height, width), tile_grid_size)
+    else:
+        tile_height, tile_width = tile_size
+    tiles_x = -(-width // tile_width)  # Ceiling division
+    tiles_y = -(-height // tile_height)
+
+    tile_area = tile_height * tile_width
+    limit = max(int(clip_limit * tile_area / hist_size), 1) if clip_limit > 0 else 0
+
+    # Columns of the padded tile grid, mapped back into the image
+    padded_columns = _reflect_101(np.arange(tiles_x * tile_width), width)
+
+    luts = {}  # tile row index -> (tiles_x, hist_size) LUTs; at most two rows are kept
+
+    def lut_row(tile_row):
+        if tile_row not in luts:
+            rows = _reflect_101(np.arange(tile_row * tile_height, (tile_row + 1) * tile_height), height)
+            if rows[-1] == rows[0] + tile_height - 1:  # Plain slice unless the reflected border is involved
+                pixels = np.asarray(source[rows[0]:rows[-1] + 1])
+            else:
+                pixels = np.asarray(source[rows])
+            luts[tile_row] = _tile_row_luts(pixels[:, padded_columns], tiles_x, tile_width, limit, hist_size)
+        return luts[tile_row]
+
+    # Horizontal interpolation terms, shared by every row (float32 as in OpenCV)
+    inv_tw = np.float32(1.0) / np.float32(tile_width)
+    txf = np.arange(width, dtype=np.float32) * inv_tw - np.float32(0.5)
+    tx1 = np.floor(txf).astype(np.int64)
+    xa = txf - tx1.astype(np.float32)
+    xa1 = np.float32(1.0) - xa
+    index_1 = np.maximum(tx1, 0)
+    index_2 = np.minimum(tx1 + 1, tiles_x - 1)
+
+    inv_th = np.float32(1.0) / np.float32(tile_height)
+    row = 0
+    while row < height:
+        # Rows between two tile-row centers blend the same pair of LUT rows
+        tyf_row = np.float32(row) * inv_th - np.float32(0.5)
+        ty1 = int(np.floor(tyf_row))
+        row_stop = row + 1
+        while row_stop < height and int(np.floor(np.float32(row_stop) * inv_th - np.float32(0.5))) == ty1:
+            row_stop += 1
+
+        lut_1 = lut_row(max(ty1, 0))
+        lut_2 = lut_row(min(ty1 + 1, tiles_y - 1))
+        for stale in [key for key in luts if key < max(ty1, 0)]:
+            del luts[stale]
+
+        band = np.asarray(source[row:row_stop])
+        tyf = np.arange(row, row_stop, dtype=np.float32)[:, np.newaxis] * inv_th - np.float32(0.5)
+        ya = tyf - np.float32(ty1)
+        ya1 = np.float32(1.0) - ya
+
+        top = lut_1[index_1, band].astype(np.float32) * xa1 + lut_1[index_2, band].astype(np.float32) * xa
+        bottom = lut_2[index_1, band].astype(np.float32) * xa1 + lut_2[index_2, band].astype(np.float32) * xa
+        result = top * ya1 + bottom * ya
+        yield row, np.clip(np.rint(result), 0, hist_size - 1).astype(lut_1.dtype)
+        row = row_stop
+
+
+def clahe_streaming(source, out=None, clip_limit=2.0, tile_grid_size=(8, 8), tile_size=None, bit_depth=None):
+    """
+    Applies streaming CLAHE and writes every band into `out` as soon as it is ready.
+
+    Args:
+        source (np.array or np.memmap): uint8 or uint16 grayscale image (H, W).
+        out (np.array or np.memmap, optional): Output of the same shape and dtype (allocated if None).
+        clip_limit, tile_grid_size, tile_size: See iter_clahe_bands.
+        bit_depth (int, optional): See iter_clahe_bands (defaults to the dtype's full range).
+
+    Returns:
+        np.array or np.memmap: The equalized image (`out`).
+    """
+    if source.dtype not in (np.uint8, np.uint16) or len(source.shape) != 2:
+        raise ValueError("Streaming CLAHE expects a 2-D uint8 or uint16 grayscale image.")
+    if bit_depth is None:
+        bit_depth = 8 * source.dtype.itemsize
+    if out is None:
+        out = np.empty(source.shape, dtype=source.dtype)
+    for row_start, band in iter_clahe_bands(source, clip_limit, tile_grid_size, tile_size, bit_depth):
+        out[row_start:row_start + band.shape[0]] = band
+    return out
+
+
+if __name__ == '__main__':
+    # Path to your image file.
+    IMAGE_PATH = "sample_images/foto1.jpeg"
+
+    try:
+        gray_image = cv2.imread(IMAGE_PATH, 0)
+        if gray_image is None:
+            raise FileNotFoundError(f"Image not found or could not be opened: {IMAGE_PATH}")
+
+        # In-memory reference
+        in_memory = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8)).apply(gray_image)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # Simulate a large on-disk scan with memory-mapped input and output files
+            source = np.memmap(os.path.join(temp_dir, "input.dat"), dtype=np.uint8, mode='w+',
+                               shape=gray_image.shape)
+            source[:] = gray_image
+            output = np.memmap(os.path.join(temp_dir, "output.dat"), dtype=np.uint8, mode='w+',
+                               shape=gray_image.shape)
+
+            start = time.perf_counter()
+            clahe_streaming(source, out=output, clip_limit=2.0, tile_grid_size=(8, 8))
+            output.flush()
+            print(f"Streaming CLAHE took {time.perf_counter() - start:.2f} s; "
+                  f"identical to cv2 CLAHE: {np.array_equal(np.asarray(output), in_memory)}")
+            streamed = np.array(output)
+            del source, output
+
+        plt.figure(figsize=(12, 6))
+
+        plt.subplot(1, 2, 1)
+        plt.imshow(in_memory, cmap='gray')
+        plt.title('In-memory CLAHE (cv2)')
+        plt.axis('off')
+
+        plt.subplot(1, 2, 2)
+        plt.imshow(streamed, cmap='gray')
+        plt.title('Streaming CLAHE (memory-mapped bands)')
+        plt.axis('off')
+
+        plt.tight_layout()
+        plt.show()
+
+    except FileNotFoundError as fnf_error:
+        print(fnf_error)
+    except Exception as e:
+        import traceback
+
+        print(f"An unexpected error occurred: {e}")
+        traceback.print_exc()
@@ -0,0 +1,235 @@
+import io
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import cv2
+import numpy as np
+import matplotlib.pyplot as plt
+
+from create_color_histograms import CHANNEL_LABELS
+
+# File extensions considered images when scanning a directory
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff', '.webp')
+
+
+class HistogramAccumulator:
+    """
+    Mergeable 256-bin intensity histograms for a whole dataset.
+    'color' accumulators hold 4 rows (B, G, R, grayscale, as in compute_channel_histograms);
+    'gray' accumulators hold 1 row. Counts are int64, so totals over millions of images stay exact.
+    Accumulators can be added, subtracted (e.g. to remove a folder from a total) and serialized.
+    """
+
+    def __init__(self, mode='color', counts=None, images=0):
+        if mode not in ('color', 'gray'):
+            raise ValueError("mode must be 'color' or 'gray'.")
+        self.mode = mode
+        rows = 4 if mode == 'color' else 1
+        self.counts = np.zeros((rows, 256), dtype=np.int64) if counts is None else np.asarray(counts, dtype=np.int64)
+        if self.counts.shape != (rows, 256):
+            raise ValueError(f"Counts for mode '{mode}' must have shape ({rows}, 256).")
+        self.images = images
+
+    def add_image(self, image):
+        """Adds one decoded uint8 image (BGR for 'color', single channel for 'gray')."""
+        if image.dtype != np.uint8:
+            raise ValueError(f"Expected a uint8 image, got {image.dtype}.")
+        if self.mode == 'color':
+            if image.ndim != 3 or image.shape[2] != 3:
+                raise ValueError("'color' accumulators expect a BGR image of shape (H, W, 3).")
+            # np.bincount counts in int64 directly (cv2.calcHist returns float32, exact only up to 2**24)
+            for channel in range(3):
+                self.counts[channel] += np.bincount(image[..., channel].ravel(), minlength=256)
+            self.counts[3] += np.bincount(cv2.cvtColor(image, cv2.COLOR_BGR2GRAY).ravel(), minlength=256)
+        else:
+            self.counts[0] += np.bincount(image.ravel(), minlength=256)
+        self.images += 1
+
+    def _check_compatible(self, other):
+        if not isinstance(other, HistogramAccumulator) or other.mode != self.mode:
+            raise TypeError("Only accumulators with the same mode can be combined.")
+
+    def __iadd__(self, other):
+        self._check_compatible(other)
+        self.counts += other.counts
+        self.images += other.images
+        return self
+
+    def __add__(self, other):
+        self._check_compatible(other)
+        return HistogramAccumulator(self.mode, self.counts + other.counts, self.images + other.images)
+
+    def __isub__(self, other):
+        self._check_compatible(other)
+        if np.any(other.counts > self.counts) or other.images > self.images:
+            raise ValueError("Cannot subtract an accumulator that is not contained in this one.")
+        self.counts -= other.counts
+        self.images -= other.images
+        return self
+
+    def __sub__(self, other):
+        result = self.copy()
+        result -= other
+        return result
+
+    def copy(self):
+        return HistogramAccumulator(self.mode, self.counts.copy(), self.images)
+
+    def normalized(self):
+        """Returns the histograms as probabilities (each row sums to 1, or 0 if empty)."""
+        totals = self.counts.sum(axis=1, keepdims=True)
+        return self.counts / np.where(totals > 0, totals, 1)
+
+    def to_bytes(self):
+        """Serializes the accumulator (mode, image count and counts) to a compact .npz byte string."""
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, mode=np.array(self.mode), images=np.array(self.images), counts=self.counts)
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data):
+        with np.load(io.BytesIO(data)) as archive:
+            return cls(str(archive['mode']), archive['counts'], int(archive['images']))
+
+    def save(self, path):
+        with open(path, 'wb') as output_file:
+            output_file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as input_file:
+            return cls.from_bytes(input_file.read())
+
+
+def iter_image_paths(root, extensions=IMAGE_EXTENSIONS):
+    """Yields image file paths under `root` lazily, so huge trees are never listed in memory at once."""
+    for dir_path, _, file_names in os.walk(root):
+        for file_name in sorted(file_names):
+            if file_name.lower().endswith(extensions):
+                yield os.path.join(dir_path, file_name)
+
+
+def _histogram_chunk(paths, mode):
+    """
+    Worker task: decodes a chunk of files and returns only their summed 256-bin counts.
+    Returns (counts, images, failed) so the parent never receives pixel data.
+    """
+    partial = HistogramAccumulator(mode)
+    failed = 0
+    read_flag = cv2.IMREAD_COLOR if mode == 'color' else cv2.IMREAD_GRAYSCALE
+    for path in paths:
+        image = cv2.imread(path, read_flag)
+        if image is None:
+            failed += 1
+            continue
+        partial.add_image(image)
+    return partial.counts, partial.images, failed
+
+
+def _chunked(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def scan_histograms(paths, mode='color', workers=None, chunksize=32, max_pending=None, progress=None):
+    """
+    Streams image files through a process pool and merges their histograms in the parent.
+    Files are sent in chunks of `chunksize` paths; each worker decodes its chunk and sends back one
+    partial 256-bin result. At most `max_pending` chunks are in flight, so the path iterator is consumed
+    lazily and memory stays flat no matter how many files there are.
+
+    Args:
+        paths (str or iterable): A directory (scanned recursively) or an iterable of file paths.
+        mode (str): 'color' (B, G, R, gray) or 'gray'.
+        workers (int, optional): Number of worker processes (defaults to os.cpu_count()).
+        chunksize (int): Number of files per worker task.
+        max_pending (int, optional): Maximum chunks in flight (defaults to 2 * workers).
+        progress (callable, optional): Called as progress(images_done, files_failed) after each chunk.
+
+    Returns:
+        tuple: (HistogramAccumulator, failed_file_count)
+    """
+    if isinstance(paths, str):
+        paths = iter_image_paths(paths)
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or 2 * workers
+
+    total = HistogramAccumulator(mode)
+    failed = 0
+    chunks = _chunked(paths, chunksize)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for chunk in chunks:
+            pending.add(executor.submit(_histogram_chunk, chunk, mode))
+            if len(pending) < max_pending:
+                continue
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            failed += _merge_results(total, done, mode)
+            if progress is not None:
+                progress(total.images, failed)
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            failed += _merge_results(total, done, mode)
+            if progress is not None:
+                progress(total.images, failed)
+
+    return total, failed
+
+
+def _merge_results(total, futures, mode):
+    failed = 0
+    for future in futures:
+        counts, images, chunk_failed = future.result()
+        total += HistogramAccumulator(mode, counts, images)
+        failed += chunk_failed
+    return failed
+
+
+if __name__ == '__main__':
+    # Directory to scan (all images below it are included)
+    IMAGE_DIR = "sample_images"
+
+    try:
+        if not os.path.isdir(IMAGE_DIR):
+            raise FileNotFoundError(f"Directory not found: {IMAGE_DIR}")
+
+        start = time.perf_counter()
+        dataset, failed_files = scan_histograms(
+            IMAGE_DIR, workers=2, chunksize=2,
+            progress=lambda done, failed: print(f"  processed {done} images ({failed} failed)"))
+        print(f"Scanned {dataset.images} images in {time.perf_counter() - start:.2f} s ({failed_files} failed).")
+
+        # Accumulators round-trip through bytes and can be merged or subtracted later
+        restored = HistogramAccumulator.from_bytes(dataset.to_bytes())
+        print(f"Serialized size: {len(dataset.to_bytes())} bytes, round trip ok: "
+              f"{np.array_equal(restored.counts, dataset.counts)}")
+
+        plot_colors = ('blue', 'green', 'red', 'gray')
+        probabilities = dataset.normalized()
+        plt.figure(figsize=(10, 6))
+        plt.title(f'Dataset Histograms for {IMAGE_DIR} ({dataset.images} images)')
+        plt.xlabel('Pixel Intensity')
+        plt.ylabel('Fraction of Pixels')
+        for i, color_name in enumerate(plot_colors):
+            plt.plot(probabilities[i], color=color_name, label=CHANNEL_LABELS[i])
+        plt.xlim([0, 256])
+        plt.legend()
+        plt.grid(True, linestyle='--', alpha=0.7)
+        plt.tight_layout()
+        plt.show()
+
+    except FileNotFoundError as fnf_error:
+        print(fnf_error)
+    except Exception as e:
+        import traceback
+
+        print(f"An unexpected error occurred: {e}")
+        traceback.print_exc()
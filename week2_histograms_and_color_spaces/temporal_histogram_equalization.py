@@ -0,0 +1,179 @@
+import time
+
+import cv2  # OpenCV for histograms, LUT application and the per-frame reference
+import numpy as np
+import matplotlib.pyplot as plt
+
+
+def equalization_lut(hist):
+    """
+    Builds the 256-entry histogram-equalization LUT the same way cv2.equalizeHist does:
+    bins up to the first occupied one map to 0 and the rest follow the CDF scaled to 0..255.
+
+    Args:
+        hist (np.array): 256-bin histogram (counts or any non-negative weights).
+
+    Returns:
+        np.array: uint8 LUT of shape (256,).
+    """
+    hist = np.asarray(hist, dtype=np.float64).ravel()
+    occupied = np.flatnonzero(hist)
+    lut = np.zeros(256, dtype=np.uint8)
+    if len(occupied) == 0:
+        return lut
+    first = occupied[0]
+    total = hist.sum()
+    if hist[first] >= total:  # Single intensity: OpenCV maps everything to it
+        lut[:] = first
+        return lut
+
+    scale = np.float32(255.0) / np.float32(total - hist[first])
+    cdf = np.cumsum(hist[first + 1:]).astype(np.float32)
+    lut[first + 1:] = np.clip(np.rint(cdf * scale), 0, 255).astype(np.uint8)
+    return lut
+
+
+class TemporalHistogramEqualizer:
+    """
+    Histogram equalization for video that keeps an exponentially weighted histogram across frames.
+    The LUT is rebuilt only when the running histogram has moved more than `rebuild_distance`
+    (total variation distance, 0..1) from the histogram the current LUT was built from; otherwise
+    the cached LUT is applied with cv2.LUT. This skips the CDF work on most frames and damps flicker.
+    With alpha=1 and rebuild_distance=0 every frame is equalized exactly like cv2.equalizeHist.
+
+    Example:
+        equalizer = TemporalHistogramEqualizer(alpha=0.1, rebuild_distance=0.02)
+        for frame in frames:
+            output = equalizer.apply(frame)
+    """
+
+    def __init__(self, alpha=0.1, rebuild_distance=0.02, sample_step=1):
+        """
+        Args:
+            alpha (float): Weight of the newest frame's histogram in the running average (0 < alpha <= 1).
+            rebuild_distance (float): Total variation distance that triggers a LUT rebuild.
+            sample_step (int): Histogram only every n-th row and column (1 = all pixels) to save time on large frames.
+        """
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1].")
+        self.alpha = alpha
+        self.rebuild_distance = rebuild_distance
+        self.sample_step = sample_step
+        self.histogram = None  # Running histogram (probabilities)
+        self.lut = None
+        self._lut_histogram = None  # Running histogram at the last LUT rebuild
+        self.frames = 0
+        self.rebuilds = 0
+
+    def update(self, gray_frame):
+        """Adds one grayscale frame to the running histogram and rebuilds the LUT if it drifted. Returns the LUT."""
+        sampled = gray_frame[::self.sample_step, ::self.sample_step] if self.sample_step > 1 else gray_frame
+        hist = cv2.calcHist([sampled], [0], None, [256], [0, 256]).ravel().astype(np.float64)
+        hist /= hist.sum()
+
+        if self.histogram is None:
+            self.histogram = hist
+        else:
+            self.histogram *= 1.0 - self.alpha
+            self.histogram += self.alpha * hist
+
+        if self.lut is None or 0.5 * np.abs(self.histogram - self._lut_histogram).sum() > self.rebuild_distance:
+            self.lut = equalization_lut(self.histogram * sampled.size)
+            self._lut_histogram = self.histogram.copy()
+            self.rebuilds += 1
+        self.frames += 1
+        return self.lut
+
+    def apply(self, frame):
+        """
+        Equalizes one frame with the temporal LUT.
+
+        Args:
+            frame (np.array): uint8 grayscale (H, W) or BGR (H, W, 3) frame; color frames are
+                              equalized on their luma (Y of YCrCb) channel.
+
+        Returns:
+            np.array: The equalized frame.
+        """
+        if frame.ndim == 2:
+            return cv2.LUT(frame, self.update(frame))
+        ycrcb = cv2.cvtColor(frame, cv2.COLOR_BGR2YCrCb)
+        luma = ycrcb[:, :, 0]
+        ycrcb[:, :, 0] = cv2.LUT(luma, self.update(luma))
+        return cv2.cvtColor(ycrcb, cv2.COLOR_YCrCb2BGR)
+
+    def reset(self):
+        """Forgets the running histogram, e.g. after a scene cut."""
+        self.histogram = self.lut = self._lut_histogram = None
+
+
+if __name__ == '__main__':
+    # Path to your image file (a synthetic video clip is generated from it).
+    IMAGE_PATH = "sample_images/foto1.jpeg"
+
+    try:
+        gray_image = cv2.imread(IMAGE_PATH, 0)
+        if gray_image is None:
+            raise FileNotFoundError(f"Image not found or could not be opened: {IMAGE_PATH}")
+
+        # Simulate 120 frames of a static scene with sensor noise and a bright object that grows and shrinks
+        rng = np.random.default_rng(0)
+        height, width = gray_image.shape
+        frames = []
+        for index in range(120):
+            frame = gray_image.copy()
+            object_width = int(width * (0.1 + 0.3 * abs(np.sin(index / 15))))
+            frame[height // 3:2 * height // 3, :object_width] = 250
+            frames.append(cv2.add(frame, rng.integers(0, 4, frame.shape, dtype=np.uint8)))
+
+        start = time.perf_counter()
+        per_frame = [cv2.equalizeHist(frame) for frame in frames]
+        per_frame_seconds = time.perf_counter() - start
+
+        equalizer = TemporalHistogramEqualizer(alpha=0.1, rebuild_distance=0.02, sample_step=2)
+        start = time.perf_counter()
+        temporal = [equalizer.apply(frame) for frame in frames]
+        temporal_seconds = time.perf_counter() - start
+
+        # Frame-to-frame change in mean brightness of the static top band is a simple flicker measure
+        background = (slice(0, height // 4), slice(None))
+        per_frame_means = np.array([frame[background].mean() for frame in per_frame])
+        temporal_means = np.array([frame[background].mean() for frame in temporal])
+        print(f"cv2.equalizeHist per frame: {len(frames) / per_frame_seconds:.0f} fps, "
+              f"background flicker {np.abs(np.diff(per_frame_means)).mean():.2f}")
+        print(f"Temporal equalizer: {len(frames) / temporal_seconds:.0f} fps, "
+              f"background flicker {np.abs(np.diff(temporal_means)).mean():.2f}, "
+              f"LUT rebuilt on {equalizer.rebuilds} of {equalizer.frames} frames")
+
+        plt.figure(figsize=(12, 8))
+
+        plt.subplot(2, 2, 1)
+        plt.imshow(per_frame[-1], cmap='gray')
+        plt.title('cv2.equalizeHist (last frame)')
+        plt.axis('off')
+
+        plt.subplot(2, 2, 2)
+        plt.imshow(temporal[-1], cmap='gray')
+        plt.title('Temporal equalization (last frame)')
+        plt.axis('off')
+
+        plt.subplot(2, 1, 2)
+        plt.plot([frame[background].mean() for frame in frames], color='gray', label='Input')
+        plt.plot(per_frame_means, color='red', label='Per-frame equalization')
+        plt.plot(temporal_means, color='blue', label='Temporal equalization')
+        plt.title('Mean Background Brightness per Frame')
+        plt.xlabel('Frame')
+        plt.ylabel('Mean Intensity')
+        plt.legend()
+        plt.grid(True, linestyle='--', alpha=0.7)
+
+        plt.tight_layout()
+        plt.show()
+
+    except FileNotFoundError as fnf_error:
+        print(fnf_error)
+    except Exception as e:
+        import traceback
+
+        print(f"An unexpected error occurred: {e}")
+        traceback.print_exc()
@@ -27,45 +27,111 @@ def add_salt_and_pepper_noise(image_array, amount=0.05):
     return output_image
 
 
-def conservative_smoother(image_array, kernel_size):
+def _running_extreme(array, window, axis, reduce_op):
     """
-    Applies Conservative Smoothing to a grayscale image (NumPy array).
+    Computes a forward running min or max along one axis using the van Herk/Gil-Werman algorithm.
+    out[i] = reduce_op(array[i : i + window]) along `axis`, so the output is `window - 1` shorter.
+    The cost per element is constant (about three comparisons) regardless of the window size.
     Args:
-        image_array (np.array): Input grayscale image.
+        array (np.array): Input array (any number of dimensions).
+        window (int): Length of the running window (>= 1).
+        axis (int): Axis along which the window slides.
+        reduce_op (np.ufunc): np.minimum or np.maximum.
+    Returns:
+        np.array: Running extreme with length `n - window + 1` along `axis`.
+    """
+    if window == 1:
+        return array
+
+    moved = np.moveaxis(array, axis, -1)
+    n = moved.shape[-1]
+    n_blocks = -(-n // window)  # Ceiling division
+
+    # Pad the last block to a full window; the padded values are never used by valid outputs.
+    pad_amount = n_blocks * window - n
+    pad_width = [(0, 0)] * (moved.ndim - 1) + [(0, pad_amount)]
+    blocks = np.pad(moved, pad_width, mode='edge').reshape(moved.shape[:-1] + (n_blocks, window))
+
+    # Prefix extreme inside each block (g) and suffix extreme inside each block (h).
+    prefix = reduce_op.accumulate(blocks, axis=-1).reshape(moved.shape[:-1] + (-1,))
+    suffix = reduce_op.accumulate(blocks[..., ::-1], axis=-1)[..., ::-1].reshape(moved.shape[:-1] + (-1,))
+
+    # A window starting at i spans the tail of one block and the head of the next.
+    result = reduce_op(suffix[..., :n - window + 1], prefix[..., window - 1:n])
+    return np.moveaxis(result, -1, axis)
+
+
+def _window_extreme(padded_image, rows, cols, kernel_size, reduce_op, exclude_center):
+    """
+    Windowed min or max of a padded image computed with separable running passes.
+    Args:
+        padded_image (np.array): Image padded by kernel_size // 2 on both spatial axes.
+        rows (int), cols (int): Spatial size of the unpadded image.
+        kernel_size (int): Size of the square kernel (odd).
+        reduce_op (np.ufunc): np.minimum or np.maximum.
+        exclude_center (bool): If True, the center pixel is left out of each window.
+    Returns:
+        np.array: Windowed extreme with the same spatial size as the unpadded image.
+    """
+    k_half = kernel_size // 2
+
+    # Horizontal pass over the full kernel width: shape (rows + 2*k_half, cols, ...)
+    horizontal = _running_extreme(padded_image, kernel_size, 1, reduce_op)
+    if not exclude_center:
+        # Vertical pass over the full kernel height gives the whole square window.
+        return _running_extreme(horizontal, kernel_size, 0, reduce_op)
+
+    # Without the center pixel the window splits into four rectangles:
+    # the k_half rows above, the k_half rows below, and the left/right halves of the center row.
+    vertical_half = _running_extreme(horizontal, k_half, 0, reduce_op)
+    above = vertical_half[:rows]
+    below = vertical_half[k_half + 1:k_half + 1 + rows]
+
+    center_rows = padded_image[k_half:k_half + rows]
+    horizontal_half = _running_extreme(center_rows, k_half, 1, reduce_op)
+    left = horizontal_half[:, :cols]
+    right = horizontal_half[:, k_half + 1:k_half + 1 + cols]
+
+    return reduce_op(reduce_op(above, below), reduce_op(left, right))
+
+
+def conservative_smoother(image_array, kernel_size, exclude_center=False):
+    """
+    Applies Conservative Smoothing to a grayscale or color image (NumPy array).
+    Each pixel is clamped to the [min, max] range of its neighborhood. The windowed
+    min/max are computed with separable running min/max passes over the whole array,
+    so the cost per pixel does not grow with the kernel size.
+    Args:
+        image_array (np.array): Input image, grayscale (H, W) or color (H, W, C).
+                                Color images are processed channel by channel.
         kernel_size (int): Size of the square kernel (must be odd, e.g., 3, 5).
+        exclude_center (bool): If True, the min/max are taken over the neighbors only
+                               (the classic conservative smoothing definition), so isolated
+                               outliers are pulled back into the neighborhood range.
     Returns:
-        np.array: Smoothed grayscale image.
+        np.array: Smoothed image with the same shape and dtype as the input.
     """
     if kernel_size % 2 == 0:
         raise ValueError("Kernel size must be an odd integer.")
+    if image_array.ndim not in (2, 3):
+        raise ValueError("Input must be a grayscale (H, W) or color (H, W, C) image.")
 
     k_half = kernel_size // 2
-    rows, cols = image_array.shape
-    output_image = np.copy(image_array)  # Start with a copy of the original
+    if k_half == 0:
+        return np.copy(image_array)  # A 1x1 window never changes a pixel
 
-    # Pad the image to handle borders
-    # This simplifies kernel operations near the image edges.
-    padded_image = np.pad(image_array, pad_width=k_half, mode='edge')
+    rows, cols = image_array.shape[:2]
 
-    for r in range(rows):
-        for c in range(cols):
-            # Current pixel in the original image corresponds to (r+k_half, c+k_half) in padded image
-            center_pixel_value = image_array[r, c]
+    # Pad the image to handle borders (only the spatial axes, never the channel axis)
+    pad_width = ((k_half, k_half), (k_half, k_half)) + ((0, 0),) * (image_array.ndim - 2)
+    padded_image = np.pad(image_array, pad_width=pad_width, mode='edge')
 
-            # Extract the kernel window from the padded image
-            # The window is centered around the current pixel's equivalent in the padded image
-            kernel_window = padded_image[r: r + kernel_size, c: c + kernel_size]
+    min_in_window = _window_extreme(padded_image, rows, cols, kernel_size, np.minimum, exclude_center)
+    max_in_window = _window_extreme(padded_image, rows, cols, kernel_size, np.maximum, exclude_center)
 
-            min_val_in_window = np.min(kernel_window)
-            max_val_in_window = np.max(kernel_window)
-
-            if center_pixel_value < min_val_in_window:
-                output_image[r, c] = min_val_in_window
-            elif center_pixel_value > max_val_in_window:
-                output_image[r, c] = max_val_in_window
-            # else: the pixel value remains unchanged (already handled by np.copy)
-
-    return output_image
+    # Values below the minimum become the minimum, values above the maximum become the maximum,
+    # everything else is left unchanged.
+    return np.clip(image_array, min_in_window, max_in_window).astype(image_array.dtype, copy=False)
 
 
 try:
@@ -81,11 +147,13 @@ try:
     noisy_image = add_salt_and_pepper_noise(gray_image, amount=0.05)
 
     # --- Apply Conservative Smoothing ---
+    # exclude_center=True compares each pixel with its neighbors only, which is what
+    # lets the filter pull isolated salt/pepper pixels back into the local range.
     kernel_s = 3  # Kernel size (e.g., 3 for 3x3, 5 for 5x5)
-    smoothed_image = conservative_smoother(noisy_image, kernel_s)
+    smoothed_image = conservative_smoother(noisy_image, kernel_s, exclude_center=True)
 
     kernel_s_large = 5
-    smoothed_image_large_kernel = conservative_smoother(noisy_image, kernel_s_large)
+    smoothed_image_large_kernel = conservative_smoother(noisy_image, kernel_s_large, exclude_center=True)
 
     print(f"Applied Conservative Smoothing to noisy version of '{IMAGE_PATH}'. Displaying results...")
 
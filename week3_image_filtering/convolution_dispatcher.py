@@ -0,0 +1,221 @@
+import functools
+import math
+import time
+
+import cv2  # OpenCV for filter2D, sepFilter2D and its DFT
+import numpy as np
+
+from kernel_registry import default_registry
+
+METHODS = ('direct', 'separable', 'fft')
+
+# Cost model in seconds, fitted by calibrate(). The defaults were measured on a reference machine.
+#   direct:    per-pixel cost of cv2.filter2D, tabulated against kernel area (log-linear interpolation).
+#              A table rather than one coefficient, because OpenCV itself switches to a tiled DFT for
+#              larger kernels and the cost stops growing with the area.
+#   separable: seconds per pixel per tap of cv2.sepFilter2D (rank * (kh + kw) taps).
+#   fft:       seconds per P * log2(P) of the whole-frame DFT, P being the padded DFT size.
+_cost_model = {
+    'direct_areas': np.array([9, 25, 49, 81, 121, 225, 441, 961, 2601, 10201, 40401], dtype=np.float64),
+    'direct_costs': np.array([1.2, 1.7, 2.9, 4.8, 7.5, 20.5, 19.2, 21.0, 21.1, 44.5, 66.0]) * 1e-9,
+    'separable': 0.17e-9,
+    'fft': 0.51e-9,
+}
+
+
+def _dft_shape(image_shape, kernel_shape):
+    return (cv2.getOptimalDFTSize(image_shape[0] + kernel_shape[0] - 1),
+            cv2.getOptimalDFTSize(image_shape[1] + kernel_shape[1] - 1))
+
+
+def estimate_costs(image_shape, kernel_shape, separable_rank=0):
+    """
+    Estimated run time (seconds) of each convolution method under the current cost model.
+
+    Args:
+        image_shape (tuple): (rows, cols) of the image.
+        kernel_shape (tuple): (rows, cols) of the kernel.
+        separable_rank (int): Number of separable passes the kernel splits into (0: 'separable' is not offered).
+
+    Returns:
+        dict: {method: seconds} for the applicable methods.
+    """
+    pixels = image_shape[0] * image_shape[1]
+    area = kernel_shape[0] * kernel_shape[1]
+    log_areas = np.log(_cost_model['direct_areas'])
+    costs = _cost_model['direct_costs']
+    if area <= _cost_model['direct_areas'][-1]:
+        per_pixel = np.interp(math.log(area), log_areas, costs)
+    else:  # Extend the last segment beyond the measured range
+        slope = (costs[-1] - costs[-2]) / (log_areas[-1] - log_areas[-2])
+        per_pixel = costs[-1] + slope * (math.log(area) - log_areas[-1])
+    estimates = {'direct': per_pixel * pixels}
+    if separable_rank:
+        taps = separable_rank * (kernel_shape[0] + kernel_shape[1])
+        estimates['separable'] = _cost_model['separable'] * pixels * taps
+    rows, cols = _dft_shape(image_shape, kernel_shape)
+    estimates['fft'] = _cost_model['fft'] * rows * cols * math.log2(rows * cols)
+    return estimates
+
+
+@functools.lru_cache(maxsize=256)
+def choose_method(image_shape, kernel_shape, separable_rank=0):
+    """Cheapest method for these shapes (cached per shape; the cache is cleared by calibrate())."""
+    estimates = estimate_costs(image_shape, kernel_shape, separable_rank)
+    return min(estimates, key=estimates.get)
+
+
+@functools.lru_cache(maxsize=16)
+def _kernel_spectrum(kernel_bytes, kernel_shape, dft_shape):
+    """CCS-packed DFT of the flipped kernel, zero-padded to `dft_shape` (cached per kernel and size)."""
+    kernel = np.frombuffer(kernel_bytes, dtype=np.float32).reshape(kernel_shape)
+    padded = np.zeros(dft_shape, dtype=np.float32)
+    padded[:kernel_shape[0], :kernel_shape[1]] = kernel[::-1, ::-1]
+    return cv2.dft(padded, nonzeroRows=kernel_shape[0])
+
+
+def _fft_correlate(image, kernel, border_type):
+    """cv2.filter2D semantics (correlation, centered anchor) through one whole-frame DFT."""
+    (height, width), (kh, kw) = image.shape, kernel.shape
+    dft_shape = _dft_shape(image.shape, kernel.shape)
+    top, left = kh // 2, kw // 2
+    # Border the image straight to the DFT size; the extra rows/columns only feed discarded outputs
+    padded = cv2.copyMakeBorder(image, top, dft_shape[0] - height - top, left, dft_shape[1] - width - left,
+                                border_type)
+    spectrum = cv2.mulSpectrums(cv2.dft(padded), _kernel_spectrum(kernel.tobytes(), kernel.shape, dft_shape), 0)
+    result = cv2.idft(spectrum, flags=cv2.DFT_REAL_OUTPUT | cv2.DFT_SCALE)
+    return result[kh - 1:kh - 1 + height, kw - 1:kw - 1 + width]
+
+
+def convolve(image, kernel, method='auto', border_type=cv2.BORDER_REFLECT_101, registry=None):
+    """
+    2-D filtering with cv2.filter2D semantics (correlation, centered anchor, `border_type` borders)
+    through the cheapest of three methods: 'direct' (cv2.filter2D), 'separable' (a sum of
+    cv2.sepFilter2D passes, for rank-1 and low-rank kernels) or 'fft' (whole-frame DFT).
+
+    Args:
+        image (np.array): Grayscale image (computed in float32).
+        kernel (np.array or str): 2-D kernel, or the name of a kernel in the registry.
+        method (str): 'auto' (choose_method) or one of METHODS.
+        border_type (int): OpenCV border mode.
+        registry (KernelRegistry, optional): Source of the separable decompositions
+                                             (defaults to kernel_registry.default_registry).
+
+    Returns:
+        np.array: float32 filtered image.
+    """
+    image = np.asarray(image, dtype=np.float32)
+    decomposition = (registry or default_registry).decompose(kernel)
+    kernel = decomposition.kernel.astype(np.float32)
+    separable_rank = decomposition.rank if decomposition.is_separable else 0
+    if method == 'auto':
+        method = choose_method(image.shape[:2], kernel.shape, separable_rank)
+    if method == 'direct':
+        return cv2.filter2D(image, cv2.CV_32F, kernel, borderType=border_type)
+    if method == 'separable':
+        if not separable_rank:
+            raise ValueError("The 'separable' method needs a kernel of low enough rank.")
+        return decomposition.apply(image, cv2.CV_32F, border_type)
+    if method == 'fft':
+        return _fft_correlate(image, kernel, border_type)
+    raise ValueError(f"Unknown method '{method}'; choose 'auto' or one of {METHODS}.")
+
+
+def _time(function, repeats):
+    function()  # Warm-up (also fills the kernel-spectrum cache)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        function()
+    return (time.perf_counter() - start) / repeats
+
+
+def calibrate(image_shapes=((512, 512), (1024, 1024)), kernel_sizes=(3, 5, 7, 9, 11, 15, 21, 31, 51, 101, 201),
+              repeats=3, rng=None):
+    """
+    Times every method on random float32 images and square kernels, refits the cost model and clears
+    the cached decisions.
+
+    Args:
+        image_shapes (iterable): Image shapes to measure on (costs are averaged per pixel).
+        kernel_sizes (iterable): Square kernel sizes, ascending.
+        repeats (int): Timed runs per measurement.
+        rng (np.random.Generator, optional): Random generator for the test data.
+
+    Returns:
+        dict: {image_shape: {'separable': k, 'fft': k}}: the smallest measured kernel size at which
+              each method beat cv2.filter2D (None if it never did).
+    """
+    rng = rng or np.random.default_rng(0)
+    kernel_sizes = sorted(kernel_sizes)
+    direct = np.zeros(len(kernel_sizes))
+    separable_fits, fft_fits = [], []
+    crossovers = {}
+    for shape in image_shapes:
+        image = rng.random(shape, dtype=np.float32)
+        pixels = shape[0] * shape[1]
+        crossovers[tuple(shape)] = {'separable': None, 'fft': None}
+        for index, size in enumerate(kernel_sizes):
+            vector = rng.random(size, dtype=np.float32)
+            kernel = np.outer(vector, vector)
+            times = {method: _time(lambda: convolve(image, kernel, method), repeats) for method in METHODS}
+
+            direct[index] += times['direct'] / pixels / len(image_shapes)
+            separable_fits.append(times['separable'] / (pixels * 2 * size))
+            rows, cols = _dft_shape(shape, kernel.shape)
+            fft_fits.append(times['fft'] / (rows * cols * math.log2(rows * cols)))
+            for method in ('separable', 'fft'):
+                if crossovers[tuple(shape)][method] is None and times[method] < times['direct']:
+                    crossovers[tuple(shape)][method] = size
+
+    _cost_model['direct_areas'] = np.array(kernel_sizes, dtype=np.float64) ** 2
+    _cost_model['direct_costs'] = direct
+    _cost_model['separable'] = float(np.median(separable_fits))
+    _cost_model['fft'] = float(np.median(fft_fits))
+    choose_method.cache_clear()
+    return crossovers
+
+
+if __name__ == '__main__':
+    # Path to your image file.
+    IMAGE_PATH = "sample_images/foto1.jpeg"
+
+    try:
+        gray_image = cv2.imread(IMAGE_PATH, 0)
+        if gray_image is None:
+            raise FileNotFoundError(f"Image not found or could not be opened: {IMAGE_PATH}")
+
+        print("Calibrating (this takes a few seconds)...")
+        for shape, points in calibrate().items():
+            print(f"  {shape[1]}x{shape[0]}: separable wins from {points['separable']}x{points['separable']}, "
+                  f"fft wins from {points['fft']}x{points['fft']}")
+
+        prewitt_x = np.array([[-1, 0, 1], [-1, 0, 1], [-1, 0, 1]], dtype=np.float32)
+        rng = np.random.default_rng(1)
+        kernels = {'Prewitt X 3x3': prewitt_x,
+                   'Gaussian 31x31': cv2.getGaussianKernel(31, 5) @ cv2.getGaussianKernel(31, 5).T,
+                   'Random 15x15': rng.random((15, 15)),
+                   'Difference of Gaussians 21x21': (cv2.getGaussianKernel(21, 3) @ cv2.getGaussianKernel(21, 3).T -
+                                                     cv2.getGaussianKernel(21, 6) @ cv2.getGaussianKernel(21, 6).T),
+                   'Random 151x151': rng.random((151, 151))}
+
+        float_image = gray_image.astype(np.float32)
+        for name, kernel in kernels.items():
+            kernel = kernel.astype(np.float32)
+            reference = cv2.filter2D(float_image, cv2.CV_32F, kernel)
+            filter2d_seconds = _time(lambda: cv2.filter2D(float_image, cv2.CV_32F, kernel), 3)
+            # The warm-up run inside _time pays the one-off SVD and kernel DFT, which are cached
+            dispatched_seconds = _time(lambda: convolve(float_image, kernel), 3)
+            decomposition = default_registry.decompose(kernel)
+            method = choose_method(float_image.shape, kernel.shape,
+                                   decomposition.rank if decomposition.is_separable else 0)
+            relative_error = np.abs(convolve(float_image, kernel) - reference).max() / np.abs(reference).max()
+            print(f"{name}: '{method}' {dispatched_seconds * 1000:.1f} ms vs filter2D {filter2d_seconds * 1000:.1f} ms "
+                  f"(relative difference {relative_error:.1e})")
+
+    except FileNotFoundError as fnf_error:
+        print(fnf_error)
+    except Exception as e:
+        import traceback
+
+        print(f"An unexpected error occurred: {e}")
+        traceback.print_exc()
@@ -0,0 +1,111 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2  # For image loading
+import numpy as np
+import matplotlib.pyplot as plt
+
+from fourier_filter_engine import forward_spectrum, fourier_filter, frequency_mask, inverse_spectrum
+
+
+def filter_bank(image, filters, pad=True, workers=None, log_magnitude=False):
+    """
+    Applies a bank of frequency-domain filters to one image with a single forward transform.
+    The rfft2 spectrum is computed once; each filter multiplies it by its cached mask and the
+    inverse transforms run in a thread pool (NumPy's FFT releases the GIL).
+
+    Args:
+        image (np.array): Grayscale image.
+        filters (iterable): Filter specs (filter_type, cutoff) or (filter_type, cutoff, order), with the
+                            filter types and cutoff units of fourier_filter_engine.frequency_mask.
+        pad (bool): Pad to a fast DFT size (results are cropped back).
+        workers (int, optional): Threads for the inverse transforms (defaults to os.cpu_count()).
+        log_magnitude (bool): Also return the log-magnitude spectrum, 20 * log(|F| + 1), as float32.
+
+    Returns:
+        tuple: (outputs, magnitude). `outputs` is a list of float32 images in the order of `filters`;
+               `magnitude` is the float32 log-magnitude of the half spectrum (rows shifted so DC sits
+               at the middle of the left column), or None if not requested.
+    """
+    spectrum, padded_shape = forward_spectrum(image, pad)
+    image_shape = image.shape[:2]
+
+    masks = []
+    for spec in filters:
+        filter_type, cutoff = spec[0], spec[1]
+        order = spec[2] if len(spec) > 2 else 2
+        cutoff = tuple(cutoff) if isinstance(cutoff, (list, tuple)) else cutoff
+        masks.append(frequency_mask(padded_shape, image_shape, filter_type, cutoff, order))
+
+    def apply(mask):
+        return inverse_spectrum(spectrum * mask, padded_shape, image_shape)
+
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+        outputs = list(executor.map(apply, masks))
+
+    magnitude = None
+    if log_magnitude:
+        # |F| into one float32 buffer, then log and scale in place
+        magnitude = np.abs(spectrum).astype(np.float32, copy=False)
+        np.log1p(magnitude, out=magnitude)
+        magnitude *= np.float32(20.0)
+        magnitude = np.fft.fftshift(magnitude, axes=0)
+    return outputs, magnitude
+
+
+if __name__ == '__main__':
+    # Path to your image file.
+    IMAGE_PATH = "sample_images/foto1.jpeg"
+
+    try:
+        gray_image = cv2.imread(IMAGE_PATH, 0)
+        if gray_image is None:
+            raise FileNotFoundError(f"Image not found or could not be opened: {IMAGE_PATH}")
+
+        bank = [('lowpass', 30), ('highpass', 30), ('bandpass', (20, 80)),
+                ('butterworth_lowpass', 30, 2), ('gaussian_lowpass', 30), ('gaussian_highpass', 10)]
+
+        # Each filter on its own: one forward transform per filter
+        start = time.perf_counter()
+        separate = [fourier_filter(gray_image, spec[0], spec[1], order=spec[2] if len(spec) > 2 else 2)
+                    for spec in bank]
+        separate_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        outputs, magnitude = filter_bank(gray_image, bank, log_magnitude=True)
+        bank_seconds = time.perf_counter() - start
+
+        largest_difference = max(np.abs(a - b).max() for a, b in zip(outputs, separate))
+        print(f"{len(bank)} filters separately: {separate_seconds * 1000:.1f} ms, "
+              f"as a bank: {bank_seconds * 1000:.1f} ms (max difference {largest_difference:.2e})")
+
+        plt.figure(figsize=(16, 8))
+
+        plt.subplot(2, 4, 1)
+        plt.imshow(gray_image, cmap='gray')
+        plt.title('Original Grayscale Image')
+        plt.axis('off')
+
+        plt.subplot(2, 4, 2)
+        plt.imshow(magnitude, cmap='gray')
+        plt.title('Log-Magnitude (half spectrum)')
+        plt.axis('off')
+
+        for position, (spec, output) in enumerate(zip(bank, outputs), start=3):
+            plt.subplot(2, 4, position)
+            # High-pass outputs are centered on 0, so they are shown with their own range
+            plt.imshow(output, cmap='gray')
+            plt.title(f'{spec[0]} {spec[1]}')
+            plt.axis('off')
+
+        plt.tight_layout()
+        plt.show()
+
+    except FileNotFoundError as fnf_error:
+        print(fnf_error)
+    except Exception as e:
+        import traceback
+
+        print(f"An unexpected error occurred: {e}")
+        traceback.print_exc()
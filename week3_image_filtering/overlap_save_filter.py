@@ -0,0 +1,151 @@
+import os
+import tempfile
+import time
+
+import cv2  # For image loading and kernels
+import numpy as np
+import matplotlib.pyplot as plt
+
+from fourier_filter_engine import optimal_dft_shape
+
+
+def fft_convolve(image, kernel, pad=True):
+    """
+    Full-frame linear convolution through one zero-padded rfft2 (float32), cropped to the image
+    size ('same' mode, zero boundary). Needs the whole image and its spectrum in memory; it is the
+    reference result for overlap_save_filter.
+
+    Args:
+        image (np.array): Grayscale image (H, W).
+        kernel (np.array): 2-D convolution kernel (kh, kw).
+        pad (bool): Round the transform size up to a fast DFT size.
+
+    Returns:
+        np.array: float32 array (H, W).
+    """
+    image = np.asarray(image, dtype=np.float32)
+    kernel = np.asarray(kernel, dtype=np.float32)
+    (height, width), (kh, kw) = image.shape, kernel.shape
+    full_shape = (height + kh - 1, width + kw - 1)
+    shape = optimal_dft_shape(full_shape) if pad else full_shape
+    result = np.fft.irfft2(np.fft.rfft2(image, s=shape) * np.fft.rfft2(kernel, s=shape), s=shape)
+    row_offset, col_offset = (kh - 1) // 2, (kw - 1) // 2
+    return result[row_offset:row_offset + height, col_offset:col_offset + width]
+
+
+def iter_overlap_save(source, kernel, block_rows=512):
+    """
+    Streams the linear convolution of a tall image with overlap-save over row blocks.
+    Every FFT block holds `block_rows` input rows (rounded up to a fast DFT size): the first
+    kh - 1 rows overlap the previous block and are discarded after the circular convolution, the
+    remaining rows are exact output rows. The columns are zero-padded so they never wrap. Peak memory
+    is one block and its spectrum, independent of the image height.
+
+    Args:
+        source (np.array or np.memmap): Grayscale image (H, W); only row slices are read.
+        kernel (np.array): 2-D convolution kernel (kh, kw).
+        block_rows (int): Target FFT block height; it must exceed the kernel height.
+
+    Yields:
+        tuple: (row_start, band) with band a float32 array of output rows ('same' mode, zero boundary).
+    """
+    kernel = np.asarray(kernel, dtype=np.float32)
+    height, width = source.shape[:2]
+    kh, kw = kernel.shape
+    block_shape = optimal_dft_shape((max(block_rows, 2 * kh), width + kw - 1))
+    valid_rows = block_shape[0] - (kh - 1)  # Output rows produced per block
+    kernel_spectrum = np.fft.rfft2(kernel, s=block_shape)
+
+    row_offset, col_offset = (kh - 1) // 2, (kw - 1) // 2
+    block = np.zeros(block_shape, dtype=np.float32)
+    for row_start in range(0, height, valid_rows):
+        row_stop = min(row_start + valid_rows, height)
+        # Input rows feeding output rows [row_start, row_stop); rows outside the image stay zero
+        first = row_start + row_offset - (kh - 1)
+        read_start, read_stop = max(first, 0), min(first + block_shape[0], height)
+        block[:] = 0
+        block[read_start - first:read_stop - first, :width] = source[read_start:read_stop]
+
+        result = np.fft.irfft2(np.fft.rfft2(block) * kernel_spectrum, s=block_shape)
+        yield row_start, result[kh - 1:kh - 1 + row_stop - row_start, col_offset:col_offset + width]
+
+
+def overlap_save_filter(source, kernel, out=None, block_rows=512):
+    """
+    Applies iter_overlap_save and writes every band into `out` (e.g. an np.memmap) as it is produced.
+
+    Args:
+        source (np.array or np.memmap): Grayscale image (H, W).
+        kernel (np.array): 2-D convolution kernel.
+        out (np.array or np.memmap, optional): float32 output of shape (H, W) (allocated if None).
+        block_rows (int): Target FFT block height.
+
+    Returns:
+        np.array or np.memmap: The filtered image (`out`).
+    """
+    if out is None:
+        out = np.empty(source.shape[:2], dtype=np.float32)
+    for row_start, band in iter_overlap_save(source, kernel, block_rows):
+        out[row_start:row_start + band.shape[0]] = band
+    return out
+
+
+if __name__ == '__main__':
+    # Path to your image file (stacked into a tall line-scan style strip for the demonstration).
+    IMAGE_PATH = "sample_images/foto1.jpeg"
+
+    try:
+        gray_image = cv2.imread(IMAGE_PATH, 0)
+        if gray_image is None:
+            raise FileNotFoundError(f"Image not found or could not be opened: {IMAGE_PATH}")
+
+        strip = np.tile(gray_image, (8, 1))
+        gaussian = cv2.getGaussianKernel(41, 6.0)
+        kernel = (gaussian @ gaussian.T).astype(np.float32)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = np.memmap(os.path.join(temp_dir, "strip.dat"), dtype=np.uint8, mode='w+', shape=strip.shape)
+            source[:] = strip
+            output = np.memmap(os.path.join(temp_dir, "filtered.dat"), dtype=np.float32, mode='w+',
+                               shape=strip.shape)
+
+            start = time.perf_counter()
+            overlap_save_filter(source, kernel, out=output, block_rows=512)
+            streaming_seconds = time.perf_counter() - start
+            streamed = np.array(output[:gray_image.shape[0]])
+            tail = np.array(output[-gray_image.shape[0]:])
+            del source, output
+
+        start = time.perf_counter()
+        full_frame = fft_convolve(strip, kernel)
+        full_seconds = time.perf_counter() - start
+
+        block_shape = optimal_dft_shape((512, strip.shape[1] + kernel.shape[1] - 1))
+        print(f"Strip {strip.shape[1]}x{strip.shape[0]}: overlap-save {streaming_seconds:.2f} s "
+              f"({block_shape[0]}x{block_shape[1]} FFT blocks), full frame {full_seconds:.2f} s")
+        difference = max(np.abs(streamed - full_frame[:gray_image.shape[0]]).max(),
+                         np.abs(tail - full_frame[-gray_image.shape[0]:]).max())
+        print(f"Max difference to the full-frame fft path (first and last tile): {difference:.2e}")
+
+        plt.figure(figsize=(12, 6))
+
+        plt.subplot(1, 2, 1)
+        plt.imshow(strip[:gray_image.shape[0]], cmap='gray')
+        plt.title('Strip (first tile)')
+        plt.axis('off')
+
+        plt.subplot(1, 2, 2)
+        plt.imshow(streamed, cmap='gray')
+        plt.title('Overlap-save Gaussian Blur (first tile)')
+        plt.axis('off')
+
+        plt.tight_layout()
+        plt.show()
+
+    except FileNotFoundError as fnf_error:
+        print(fnf_error)
+    except Exception as e:
+        import traceback
+
+        print(f"An unexpected error occurred: {e}")
+        traceback.print_exc()
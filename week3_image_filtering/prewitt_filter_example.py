@@ -2,6 +2,8 @@ import cv2  # OpenCV for image loading and custom filtering
 import numpy as np
 import matplotlib.pyplot as plt
 
+from kernel_registry import default_registry
+
 # Path to your image file.
 IMAGE_PATH = "sample_images/foto1.jpeg"  # Or choose another image
 
@@ -26,19 +28,22 @@ try:
                                  [0, 0, 0],
                                  [-1, -1, -1]], dtype=np.float32)
 
-    # --- Apply Prewitt Filter using cv2.filter2D() ---
-    # cv2.filter2D(src, ddepth, kernel)
-    # ddepth: Output image depth. Using -1 means output has same depth as source.
-    #         For gradient operators, it's better to use a signed type like cv2.CV_64F
+    # --- Apply Prewitt Filter through the kernel registry ---
+    # Both kernels are rank 1, so the registry splits each into a 3x1 and a 1x3 pass
+    # (e.g. Gx = [1, 1, 1]^T x [-1, 0, 1]) and applies them with cv2.sepFilter2D; the result is
+    # the same as cv2.filter2D(src, ddepth, kernel).
+    # ddepth: Output image depth. For gradient operators, it's better to use a signed type like cv2.CV_64F
     #         to capture both positive and negative slopes, then take absolute.
+    default_registry.register('prewitt_x', kernel_prewitt_x)
+    default_registry.register('prewitt_y', kernel_prewitt_y)
 
     # Apply Gx kernel
-    prewitt_x = cv2.filter2D(gray_image, cv2.CV_64F, kernel_prewitt_x)
+    prewitt_x = default_registry.apply(gray_image, 'prewitt_x', cv2.CV_64F)
     prewitt_x_abs = np.absolute(prewitt_x)
     prewitt_x_uint8 = np.uint8(prewitt_x_abs)
 
     # Apply Gy kernel
-    prewitt_y = cv2.filter2D(gray_image, cv2.CV_64F, kernel_prewitt_y)
+    prewitt_y = default_registry.apply(gray_image, 'prewitt_y', cv2.CV_64F)
     prewitt_y_abs = np.absolute(prewitt_y)
     prewitt_y_uint8 = np.uint8(prewitt_y_abs)
 
@@ -0,0 +1,143 @@
+import math
+import time
+
+import cv2
+import numpy as np
+
+from kapur_thresholding_example import kapur_threshold
+from otsu_thresholding_example import otsu_threshold
+
+
+def dkw_epsilon(samples, confidence=0.99):
+    """
+    Dvoretzky-Kiefer-Wolfowitz bound: with probability `confidence`, the empirical CDF of
+    `samples` i.i.d. pixels is within epsilon of the true CDF at every intensity.
+    """
+    return math.sqrt(math.log(2.0 / (1.0 - confidence)) / (2.0 * samples))
+
+
+def dkw_sample_size(epsilon, confidence=0.99):
+    """Number of i.i.d. samples for which dkw_epsilon(samples, confidence) <= epsilon."""
+    return math.ceil(math.log(2.0 / (1.0 - confidence)) / (2.0 * epsilon ** 2))
+
+
+def approximate_histogram(image, epsilon=0.005, confidence=0.99, method='random', initial_samples=4096, rng=None):
+    """
+    256-bin histogram of a huge uint8 image estimated from a pixel subsample.
+    The sample grows geometrically (doubling for 'random', halving the grid step for 'strided')
+    until the DKW bound on the CDF error is at most `epsilon` at the given confidence; if that would
+    need a sizeable part of the image, the exact histogram is computed instead.
+
+    'random' draws pixels uniformly with replacement, for which the bound holds exactly. 'strided'
+    reads a regular grid (faster, cache-friendly); its bound is nominal and assumes the image has
+    no structure aligned with the grid.
+
+    Args:
+        image (np.array): uint8 grayscale image.
+        epsilon (float): Target maximum CDF error (fraction of pixels).
+        confidence (float): Probability that the bound holds.
+        method (str): 'random' or 'strided'.
+        initial_samples (int): Size of the first sample.
+        rng (np.random.Generator, optional): Random generator for 'random' sampling.
+
+    Returns:
+        tuple: (hist, info). `hist` is an int64 (256,) count array over the sampled pixels; `info`
+               holds 'samples', 'epsilon' (achieved bound, 0 if exact), 'exact', 'stages' and 'seconds'.
+    """
+    if image.dtype != np.uint8 or image.ndim != 2:
+        raise ValueError("Expected a 2-D uint8 grayscale image.")
+    if method not in ('random', 'strided'):
+        raise ValueError("method must be 'random' or 'strided'.")
+    start = time.perf_counter()
+    height, width = image.shape
+
+    def exact(stages):
+        hist = cv2.calcHist([image], [0], None, [256], [0, 256]).ravel().astype(np.int64)
+        return hist, {'samples': image.size, 'epsilon': 0.0, 'exact': True, 'stages': stages,
+                      'seconds': time.perf_counter() - start}
+
+    # Beyond roughly a quarter of the pixels, sampling costs about as much as reading everything
+    if dkw_sample_size(epsilon, confidence) * 4 >= image.size:
+        return exact(0)
+
+    rng = rng or np.random.default_rng()
+    hist = np.zeros(256, dtype=np.int64)
+    samples = 0
+    stages = 0
+    stage_size = initial_samples
+    step = max(int(math.sqrt(image.size / initial_samples)), 1)
+    while True:
+        stages += 1
+        if method == 'random':
+            rows = rng.integers(0, height, stage_size)
+            cols = rng.integers(0, width, stage_size)
+            hist += np.bincount(image[rows, cols], minlength=256)
+            samples += stage_size
+            stage_size = samples  # Double the total at every stage
+        else:
+            grid = image[::step, ::step]
+            hist = np.bincount(grid.ravel(), minlength=256)
+            samples = grid.size
+            step //= 2
+
+        achieved = dkw_epsilon(samples, confidence)
+        if achieved <= epsilon:
+            return hist, {'samples': samples, 'epsilon': achieved, 'exact': False, 'stages': stages,
+                          'seconds': time.perf_counter() - start}
+        if (method == 'strided' and step < 1) or samples * 4 >= image.size:
+            return exact(stages)
+
+
+def approximate_threshold(image, algorithm='otsu', **kwargs):
+    """
+    Otsu or Kapur threshold computed from approximate_histogram.
+
+    Args:
+        image (np.array): uint8 grayscale image.
+        algorithm (str): 'otsu' or 'kapur'.
+        **kwargs: Passed to approximate_histogram (epsilon, confidence, method, ...).
+
+    Returns:
+        tuple: (threshold, info) with info as returned by approximate_histogram.
+    """
+    threshold_functions = {'otsu': otsu_threshold, 'kapur': kapur_threshold}
+    if algorithm not in threshold_functions:
+        raise ValueError("algorithm must be 'otsu' or 'kapur'.")
+    hist, info = approximate_histogram(image, **kwargs)
+    return threshold_functions[algorithm](hist, is_histogram=True), info
+
+
+if __name__ == '__main__':
+    # Path to your image file (tiled into a large mosaic for the demonstration).
+    IMAGE_PATH = "sample_images/foto1.jpeg"
+
+    try:
+        gray_image = cv2.imread(IMAGE_PATH, 0)
+        if gray_image is None:
+            raise FileNotFoundError(f"Image not found or could not be opened: {IMAGE_PATH}")
+
+        mosaic = np.tile(gray_image, (5, 5))
+        print(f"Mosaic: {mosaic.shape[1]}x{mosaic.shape[0]} ({mosaic.size / 1e6:.0f} MP)")
+
+        start = time.perf_counter()
+        exact_hist = cv2.calcHist([mosaic], [0], None, [256], [0, 256]).ravel()
+        exact_otsu = otsu_threshold(exact_hist, is_histogram=True)
+        exact_kapur = kapur_threshold(exact_hist, is_histogram=True)
+        print(f"Exact histogram: {(time.perf_counter() - start) * 1000:.1f} ms, "
+              f"Otsu {exact_otsu}, Kapur {exact_kapur}")
+        exact_cdf = np.cumsum(exact_hist) / exact_hist.sum()
+
+        for method in ('random', 'strided'):
+            hist, info = approximate_histogram(mosaic, epsilon=0.005, method=method, rng=np.random.default_rng(0))
+            cdf_error = np.abs(np.cumsum(hist) / hist.sum() - exact_cdf).max()
+            print(f"{method}: {info['samples']} samples in {info['stages']} stages, {info['seconds'] * 1000:.1f} ms, "
+                  f"bound {info['epsilon']:.4f}, actual CDF error {cdf_error:.4f}, "
+                  f"Otsu {otsu_threshold(hist, is_histogram=True)}, Kapur {kapur_threshold(hist, is_histogram=True)}")
+
+    except FileNotFoundError as fnf_error:
+        print(fnf_error)
+    except Exception as e:
+        import traceback
+
+        print(f"An unexpected error occurred: {e}")
+        traceback.print_exc()
@@ -2,56 +2,86 @@ import cv2
 import numpy as np
 import matplotlib.pyplot as plt
 
-def kapur_threshold(image):
-    hist, _ = np.histogram(image.ravel(), bins=256, range=(0, 256))
-    hist = hist.astype(np.float32)
-    hist /= hist.sum()
+def kapur_threshold(image, is_histogram=False):
+    """
+    Finds Kapur's maximum-entropy threshold for one image or a batch of histograms.
+    All 256 candidate thresholds are scored at once from cumulative sums, using
+    H(t) = log(P(t)) - S(t) / P(t), where P is the cumulative probability and
+    S the cumulative sum of p*log(p) of each class.
 
-    cumsum = np.cumsum(hist)
-    cumsum_inv = np.cumsum(hist[::-1])[::-1]
+    Args:
+        image (np.array): Grayscale image, or (if is_histogram=True) a 256-bin
+                          histogram of shape (256,) or a stack of shape (N, 256).
+        is_histogram (bool): Treat `image` as precomputed histogram(s) instead of pixels.
 
-    entropy_b = np.zeros(256)
-    entropy_f = np.zeros(256)
+    Returns:
+        int or np.array: The threshold for a single image/histogram, or an (N,)
+                         array of thresholds for a histogram stack.
+    """
+    if is_histogram:
+        hist = np.asarray(image, dtype=np.float64)
+        if hist.shape[-1] != 256 or hist.ndim not in (1, 2):
+            raise ValueError("Histograms must have shape (256,) or (N, 256).")
+    else:
+        hist = np.bincount(np.asarray(image, dtype=np.uint8).ravel(), minlength=256).astype(np.float64)
 
-    for t in range(1, 255):
-        if cumsum[t] > 0:
-            p_b = hist[:t+1] / cumsum[t]
-            entropy_b[t] = -np.sum(p_b[p_b > 0] * np.log(p_b[p_b > 0]))
-        if cumsum_inv[t+1] > 0:
-            p_f = hist[t+1:] / cumsum_inv[t+1]
-            entropy_f[t] = -np.sum(p_f[p_f > 0] * np.log(p_f[p_f > 0]))
+    single = hist.ndim == 1
+    hist = np.atleast_2d(hist)
+    totals = hist.sum(axis=1, keepdims=True)
+    p = hist / np.where(totals > 0, totals, 1)
 
+    # p*log(p) with 0*log(0) = 0
+    p_log_p = p * np.log(np.where(p > 0, p, 1))
+
+    cumsum = np.cumsum(p, axis=1)
+    cumsum_plogp = np.cumsum(p_log_p, axis=1)
+    cumsum_inv = cumsum[:, -1:] - cumsum  # Probability mass above t
+    cumsum_plogp_inv = cumsum_plogp[:, -1:] - cumsum_plogp
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        entropy_b = np.log(cumsum) - cumsum_plogp / cumsum
+        entropy_f = np.log(cumsum_inv) - cumsum_plogp_inv / cumsum_inv
+
+    # Empty classes contribute zero entropy, and only t = 1..254 are candidates
+    entropy_b = np.where(cumsum > 0, entropy_b, 0.0)
+    entropy_f = np.where(cumsum_inv > 0, entropy_f, 0.0)
     total_entropy = entropy_b + entropy_f
-    return np.argmax(total_entropy)
-
-# Görüntüyü oku
-IMAGE_PATH = "sample_images/foto1.jpeg"
-gray_image = cv2.imread(IMAGE_PATH, 0)
-if gray_image is None:
-    raise FileNotFoundError(f"Görüntü bulunamadı: {IMAGE_PATH}")
-
-# Eşikleme
-thresh_kapur_val = kapur_threshold(gray_image)
-binary_image_kapur = gray_image > thresh_kapur_val
-
-# Görselleri yan yana çiz
-fig, axes = plt.subplots(1, 3, figsize=(15, 5))
-
-# 1. Gri görüntü
-axes[0].imshow(gray_image, cmap='gray')
-axes[0].set_title("Grayscale Image")
-axes[0].axis('off')
-
-# 2. Histogram
-axes[1].hist(gray_image.ravel(), bins=256, range=(0, 256), color='gray')
-axes[1].axvline(thresh_kapur_val, color='red', linestyle='--', label=f'Thresh: {thresh_kapur_val}')
-axes[1].set_title("Histogram + Kapur Threshold")
-axes[1].legend()
-
-# 3. İkili görüntü
-axes[2].imshow(binary_image_kapur, cmap='gray')
-axes[2].set_title("Kapur Thresholded")
-axes[2].axis('off')
-
-plt.tight_layout()
-plt.show()
+    total_entropy[:, 0] = 0.0
+    total_entropy[:, 255] = 0.0
+
+    thresholds = np.argmax(total_entropy, axis=1)
+    return int(thresholds[0]) if single else thresholds
+
+
+if __name__ == '__main__':
+    # Görüntüyü oku
+    IMAGE_PATH = "sample_images/foto1.jpeg"
+    gray_image = cv2.imread(IMAGE_PATH, 0)
+    if gray_image is None:
+        raise FileNotFoundError(f"Görüntü bulunamadı: {IMAGE_PATH}")
+
+    # Eşikleme
+    thresh_kapur_val = kapur_threshold(gray_image)
+    binary_image_kapur = gray_image > thresh_kapur_val
+
+    # Görselleri yan yana çiz
+    fig, axes = plt.subplots(1, 3, figsize=(15, 5))
+
+    # 1. Gri görüntü
+    axes[0].imshow(gray_image, cmap='gray')
+    axes[0].set_title("Grayscale Image")
+    axes[0].axis('off')
+
+    # 2. Histogram
+    axes[1].hist(gray_image.ravel(), bins=256, range=(0, 256), color='gray')
+    axes[1].axvline(thresh_kapur_val, color='red', linestyle='--', label=f'Thresh: {thresh_kapur_val}')
+    axes[1].set_title("Histogram + Kapur Threshold")
+    axes[1].legend()
+
+    # 3. İkili görüntü
+    axes[2].imshow(binary_image_kapur, cmap='gray')
+    axes[2].set_title("Kapur Thresholded")
+    axes[2].axis('off')
+
+    plt.tight_layout()
+    plt.show()
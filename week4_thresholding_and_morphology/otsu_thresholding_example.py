@@ -2,61 +2,108 @@ import cv2  # OpenCV for image loading and Otsu's thresholding
 import numpy as np
 import matplotlib.pyplot as plt
 
-# Path to your image file within the sample_images subfolder of week4.
-IMAGE_PATH = "sample_images/foto1.jpeg"  # Or choose an image that might be bimodal
-
-try:
-    # Load the image in grayscale
-    gray_image = cv2.imread(IMAGE_PATH, 0)
-
-    if gray_image is None:
-        raise FileNotFoundError(f"Image not found or could not be opened: {IMAGE_PATH}")
-
-    # --- Apply Otsu's Thresholding using OpenCV ---
-    # When cv2.THRESH_OTSU is used, the threshold value (second argument to cv2.threshold)
-    # is calculated automatically. So, we can pass 0 as a placeholder.
-    # The function returns the optimal threshold value (ret_otsu) and the thresholded image.
-    # We combine THRESH_BINARY with THRESH_OTSU.
-
-    # Global thresholding with Otsu's method
-    ret_otsu, thresh_otsu = cv2.threshold(gray_image, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-
-    print(f"Applied Otsu's thresholding to '{IMAGE_PATH}'.")
-    print(f"Optimal threshold value found by Otsu's method: {ret_otsu}")
-
-    # --- Display results using Matplotlib ---
-    plt.figure(figsize=(15, 5))
-
-    # 1. Original Grayscale Image
-    plt.subplot(1, 3, 1)
-    plt.imshow(gray_image, cmap='gray')
-    plt.title('Original Grayscale Image')
-    plt.axis('off')
-
-    # 2. Histogram of the Grayscale Image (to see if it's bimodal)
-    plt.subplot(1, 3, 2)
-    plt.hist(gray_image.ravel(), bins=256, range=[0, 256], color='gray', alpha=0.75)
-    # Plot a vertical line at the threshold found by Otsu
-    plt.axvline(ret_otsu, color='red', linestyle='dashed', linewidth=2, label=f'Otsu Threshold: {ret_otsu:.0f}')
-    plt.title('Grayscale Histogram & Otsu\'s Threshold')
-    plt.xlabel('Pixel Intensity')
-    plt.ylabel('Number of Pixels')
-    plt.legend()
-    plt.grid(True, linestyle='--', alpha=0.7)
-
-    # 3. Otsu's Thresholded Image
-    plt.subplot(1, 3, 3)
-    plt.imshow(thresh_otsu, cmap='gray')
-    plt.title(f'Otsu\'s Binarization (Thresh={ret_otsu:.0f})')
-    plt.axis('off')
-
-    plt.tight_layout()
-    plt.show()
-
-except FileNotFoundError as fnf_error:
-    print(fnf_error)
-except Exception as e:
-    import traceback
-
-    print(f"An unexpected error occurred: {e}")
-    traceback.print_exc()
\ No newline at end of file
+
+def otsu_threshold(image, is_histogram=False):
+    """
+    Finds Otsu's threshold for one image or a batch of histograms, as cv2.THRESH_OTSU does.
+    All 256 candidate thresholds are scored at once from cumulative sums: the between-class
+    variance is q1 * q2 * (mu1 - mu2)^2, where class 1 holds the levels <= t.
+
+    Args:
+        image (np.array): Grayscale image, or (if is_histogram=True) a 256-bin
+                          histogram of shape (256,) or a stack of shape (N, 256).
+        is_histogram (bool): Treat `image` as precomputed histogram(s) instead of pixels.
+
+    Returns:
+        int or np.array: The threshold for a single image/histogram, or an (N,)
+                         array of thresholds for a histogram stack.
+    """
+    if is_histogram:
+        hist = np.asarray(image, dtype=np.float64)
+        if hist.shape[-1] != 256 or hist.ndim not in (1, 2):
+            raise ValueError("Histograms must have shape (256,) or (N, 256).")
+    else:
+        hist = np.bincount(np.asarray(image, dtype=np.uint8).ravel(), minlength=256).astype(np.float64)
+
+    single = hist.ndim == 1
+    hist = np.atleast_2d(hist)
+    totals = hist.sum(axis=1, keepdims=True)
+    p = hist / np.where(totals > 0, totals, 1)
+
+    q1 = np.cumsum(p, axis=1)
+    q2 = 1.0 - q1
+    mu_cumulative = np.cumsum(p * np.arange(256), axis=1)
+    mu_total = mu_cumulative[:, -1:]
+
+    # Like OpenCV, skip thresholds that leave (almost) all mass in one class
+    flt_epsilon = np.finfo(np.float32).eps
+    valid = (np.minimum(q1, q2) >= flt_epsilon) & (np.maximum(q1, q2) <= 1.0 - flt_epsilon)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mu1 = mu_cumulative / q1
+        mu2 = (mu_total - mu_cumulative) / q2
+        between_variance = np.where(valid, q1 * q2 * (mu1 - mu2) ** 2, 0.0)
+
+    thresholds = np.argmax(between_variance, axis=1)
+    thresholds[between_variance.max(axis=1) <= 0] = 0
+    return int(thresholds[0]) if single else thresholds
+
+
+if __name__ == '__main__':
+    # Path to your image file within the sample_images subfolder of week4.
+    IMAGE_PATH = "sample_images/foto1.jpeg"  # Or choose an image that might be bimodal
+
+    try:
+        # Load the image in grayscale
+        gray_image = cv2.imread(IMAGE_PATH, 0)
+
+        if gray_image is None:
+            raise FileNotFoundError(f"Image not found or could not be opened: {IMAGE_PATH}")
+
+        # --- Apply Otsu's Thresholding using OpenCV ---
+        # When cv2.THRESH_OTSU is used, the threshold value (second argument to cv2.threshold)
+        # is calculated automatically. So, we can pass 0 as a placeholder.
+        # The function returns the optimal threshold value (ret_otsu) and the thresholded image.
+        # We combine THRESH_BINARY with THRESH_OTSU.
+
+        # Global thresholding with Otsu's method
+        ret_otsu, thresh_otsu = cv2.threshold(gray_image, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+
+        print(f"Applied Otsu's thresholding to '{IMAGE_PATH}'.")
+        print(f"Optimal threshold value found by Otsu's method: {ret_otsu}")
+
+        # --- Display results using Matplotlib ---
+        plt.figure(figsize=(15, 5))
+
+        # 1. Original Grayscale Image
+        plt.subplot(1, 3, 1)
+        plt.imshow(gray_image, cmap='gray')
+        plt.title('Original Grayscale Image')
+        plt.axis('off')
+
+        # 2. Histogram of the Grayscale Image (to see if it's bimodal)
+        plt.subplot(1, 3, 2)
+        plt.hist(gray_image.ravel(), bins=256, range=[0, 256], color='gray', alpha=0.75)
+        # Plot a vertical line at the threshold found by Otsu
+        plt.axvline(ret_otsu, color='red', linestyle='dashed', linewidth=2, label=f'Otsu Threshold: {ret_otsu:.0f}')
+        plt.title('Grayscale Histogram & Otsu\'s Threshold')
+        plt.xlabel('Pixel Intensity')
+        plt.ylabel('Number of Pixels')
+        plt.legend()
+        plt.grid(True, linestyle='--', alpha=0.7)
+
+        # 3. Otsu's Thresholded Image
+        plt.subplot(1, 3, 3)
+        plt.imshow(thresh_otsu, cmap='gray')
+        plt.title(f'Otsu\'s Binarization (Thresh={ret_otsu:.0f})')
+        plt.axis('off')
+
+        plt.tight_layout()
+        plt.show()
+
+    except FileNotFoundError as fnf_error:
+        print(fnf_error)
+    except Exception as e:
+        import traceback
+
+        print(f"An unexpected error occurred: {e}")
+        traceback.print_exc()